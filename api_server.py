@@ -1,15 +1,34 @@
 #!/usr/bin/env python3
-from flask import Flask, request, jsonify, send_from_directory, make_response
+from flask import Flask, request, send_from_directory, make_response, stream_with_context
+from flask.json.provider import JSONProvider
 from pathlib import Path
-import json
+import hashlib
 import re
+import orjson
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 BASE_DIR = Path(__file__).resolve().parent
 APP_DIR = BASE_DIR / "app_public"
 DATA_DIR = APP_DIR / "data"
 
+class OrjsonProvider(JSONProvider):
+  """Flask JSON provider backed by orjson."""
+
+  def dumps(self, obj, **kwargs):
+    return orjson.dumps(obj, default=str).decode()
+
+  def loads(self, s, **kwargs):
+    return orjson.loads(s)
+
+  def response(self, *args, **kwargs):
+    obj = self._prepare_response_obj(args, kwargs)
+    return self._app.response_class(orjson.dumps(obj, default=str), mimetype="application/json")
+
 app = Flask(__name__, static_folder=str(APP_DIR), static_url_path="")
+app.json = OrjsonProvider(app)
 
 @app.before_request
 def handle_preflight():
@@ -32,22 +51,74 @@ def add_cors_headers(response):
   return response
 
 DATA_CACHE = {}
-KNOWLEDGE_BASE = None
+KNOWLEDGE_BASES = {}
+KNOWLEDGE_BASE_LOCK = threading.Lock()
+GRAM_SIZE = 3
+CACHE_MAX_AGE = 300
+SEARCH_CACHE_LIMIT = 20
+LOADER_THREADS = 4
+DATASET_FILES = (
+  "oak_island_data.json", "episodes.json", "people.json", "theories.json",
+  "events.json", "locations.json", "measurements.json"
+)
+WHITESPACE_RE = re.compile(r"\s+")
+SEASON_EPISODE_RE = re.compile(r"s(\d+)e(\d+)|season\s+(\d+).*episode\s+(\d+)", re.IGNORECASE)
 
 
 def load_json(path):
   """Load JSON file with caching."""
-  if path in DATA_CACHE:
-    return DATA_CACHE[path]
-  with Path(path).open("r", encoding="utf-8") as f:
-    data = json.load(f)
-  DATA_CACHE[path] = data
+  key = str(path)
+  if key in DATA_CACHE:
+    return DATA_CACHE[key]
+  data = orjson.loads(Path(path).read_bytes())
+  DATA_CACHE[key] = data
   return data
 
 
+def json_response(payload, status=200):
+  """Serialize payload with orjson into a JSON response."""
+  return app.response_class(orjson.dumps(payload), status=status, mimetype="application/json")
+
+
+def stream_json_list(head, key, items):
+  """Yield a JSON object of head's fields plus key: items, one item at a time."""
+  prefix = orjson.dumps(head)[:-1] + b"," if head else b"{"
+  yield prefix + orjson.dumps(key) + b":["
+  for i, item in enumerate(items):
+    yield (b"," if i else b"") + orjson.dumps(item)
+  yield b"]}"
+
+
+def stream_json_response(head, key, items):
+  """Stream a JSON object whose key list is serialized item by item."""
+  return app.response_class(stream_with_context(stream_json_list(head, key, items)), mimetype="application/json")
+
+
+def conditional_response(kb, build_response):
+  """Serve build_response() with an ETag, or 304 if the client copy is current."""
+  etag = f"{kb.etag}-{hashlib.blake2b(request.full_path.encode(), digest_size=8).hexdigest()}"
+  if etag in request.if_none_match:
+    response = make_response("", 304)
+  else:
+    response = build_response()
+  response.set_etag(etag)
+  response.headers["Cache-Control"] = f"public, max-age={CACHE_MAX_AGE}"
+  return response
+
+
 def normalize(text):
   """Normalize text for comparison."""
-  return re.sub(r"\s+", " ", (text or "").strip().lower())
+  return WHITESPACE_RE.sub(" ", (text or "").strip().lower())
+
+
+def grams(text):
+  """Distinct character n-grams of text, used by the full-text index."""
+  return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def add_posting(postings, entity_type, entity):
+  """Add entity to a full_text posting dict, deduplicated but not capped (limit is caller-supplied)."""
+  postings.setdefault(id(entity), (entity_type, entity))
 
 
 # ============================================================================
@@ -60,15 +131,25 @@ class KnowledgeBase:
   def __init__(self, data_dir, pi_mode=False):
     self.data_dir = Path(data_dir)
     self.pi_mode = pi_mode
-    self.oak_data = self._load_oak_data()
-    self.episodes = self._load_episodes()
-    self.people = self._load_people()
-    self.theories = self._load_theories()
-    self.events = self._load_events()
-    self.locations = self._load_locations()
-    self.measurements = self._load_measurements()
+    # Files are independent; overlap their reads instead of loading serially
+    with ThreadPoolExecutor(max_workers=LOADER_THREADS) as pool:
+      oak_data = pool.submit(self._load_oak_data)
+      episodes = pool.submit(self._load_episodes)
+      people = pool.submit(self._load_people)
+      theories = pool.submit(self._load_theories)
+      events = pool.submit(self._load_events)
+      locations = pool.submit(self._load_locations)
+      measurements = pool.submit(self._load_measurements)
+    self.oak_data = oak_data.result()
+    self.episodes = episodes.result()
+    self.people = people.result()
+    self.theories = theories.result()
+    self.events = events.result()
+    self.locations = locations.result()
+    self.measurements = measurements.result()
     self.artifacts = self._build_artifacts()
     self.indices = self._build_indices()
+    self.etag = self._build_etag()
   
   def _load_oak_data(self):
     """Load primary Oak Island dataset."""
@@ -110,18 +191,40 @@ class KnowledgeBase:
     return load_json(self.data_dir / "measurements.json") or []
   
   def _build_artifacts(self):
-    """Extract artifacts from locations."""
+    """Extract artifacts from locations.
+    
+    Names and normalized location names are also kept as parallel columns
+    so index builds don't re-read or re-normalize every row dict.
+    """
     artifacts = []
+    self.artifact_names = []
+    self.artifact_location_keys = []
     for loc in self.oak_data.get("locations", []):
+      loc_name = loc.get("name")
+      loc_key = normalize(loc_name)
       for art in (loc.get("artifacts") or []):
+        art_name = art.get("name") or art.get("artifact")
         artifacts.append({
-          "name": art.get("name") or art.get("artifact"),
-          "location": loc.get("name"),
+          "name": art_name,
+          "location": loc_name,
           "type": art.get("type"),
           "raw": art
         })
+        self.artifact_names.append(art_name)
+        self.artifact_location_keys.append(loc_key)
     return artifacts
   
+  def _build_etag(self):
+    """Fingerprint the dataset files so clients can revalidate cached responses."""
+    stamps = [self.pi_mode]
+    for name in DATASET_FILES:
+      try:
+        stat = (self.data_dir / name).stat()
+        stamps.append([name, stat.st_size, stat.st_mtime_ns])
+      except OSError:
+        stamps.append([name, None])
+    return hashlib.blake2b(orjson.dumps(stamps), digest_size=8).hexdigest()
+  
   def _build_indices(self):
     """Build searchable indices across all datasets."""
     indices = {
@@ -131,7 +234,13 @@ class KnowledgeBase:
       "events_by_type": defaultdict(list),
       "locations_by_name": {},
       "artifacts_by_name": {},
-      "full_text": defaultdict(list)
+      "artifacts_by_location": defaultdict(list),
+      "people_by_episode": defaultdict(list),
+      "theories_by_episode": defaultdict(list),
+      "events_by_episode": defaultdict(list),
+      "theories_by_location": defaultdict(list),
+      "events_by_location": defaultdict(list),
+      "full_text": defaultdict(dict)
     }
     
     # Index episodes
@@ -141,58 +250,108 @@ class KnowledgeBase:
     
     # Index people
     for person_record in self.people:
+      indices["people_by_episode"][(person_record.get("season"), person_record.get("episode"))].append(person_record)
       person_name = person_record.get("person", "").strip()
       if person_name:
-        indices["people_by_name"][normalize(person_name)].append(person_record)
-        indices["full_text"][normalize(person_name)].append(("person", person_record))
+        key = normalize(person_name)
+        indices["people_by_name"][key].append(person_record)
+        add_posting(indices["full_text"][key], "person", person_record)
     
     # Index theories
     for theory_record in self.theories:
+      indices["theories_by_episode"][(theory_record.get("season"), theory_record.get("episode"))].append(theory_record)
       theory_type = theory_record.get("theory", "").strip()
       if theory_type:
-        indices["theories_by_type"][normalize(theory_type)].append(theory_record)
-        indices["full_text"][normalize(theory_type)].append(("theory", theory_record))
+        key = normalize(theory_type)
+        indices["theories_by_type"][key].append(theory_record)
+        add_posting(indices["full_text"][key], "theory", theory_record)
     
     # Index events
     for event_record in self.events:
+      indices["events_by_episode"][(event_record.get("season"), event_record.get("episode"))].append(event_record)
       event_type = event_record.get("event_type", "").strip()
       if event_type:
-        indices["events_by_type"][normalize(event_type)].append(event_record)
-        indices["full_text"][normalize(event_type)].append(("event", event_record))
+        key = normalize(event_type)
+        indices["events_by_type"][key].append(event_record)
+        add_posting(indices["full_text"][key], "event", event_record)
     
-    # Index locations
+    # Index locations, remembering each record's normalized name so detail
+    # lookups for a search hit don't normalize it again
+    self.location_keys = {}
     for loc in self.locations:
       loc_name = loc.get("name", "").strip()
       if loc_name:
-        indices["locations_by_name"][normalize(loc_name)] = loc
-        indices["full_text"][normalize(loc_name)].append(("location", loc))
+        key = normalize(loc_name)
+        indices["locations_by_name"][key] = loc
+        self.location_keys[id(loc)] = key
+        add_posting(indices["full_text"][key], "location", loc)
     
     # Index artifacts
-    for art in self.artifacts:
-      art_name = art.get("name", "").strip()
+    for art, art_name, loc_key in zip(self.artifacts, self.artifact_names, self.artifact_location_keys):
+      indices["artifacts_by_location"][loc_key].append(art)
+      art_name = (art_name or "").strip()
       if art_name:
-        indices["artifacts_by_name"][normalize(art_name)] = art
-        indices["full_text"][normalize(art_name)].append(("artifact", art))
+        key = normalize(art_name)
+        indices["artifacts_by_name"][key] = art
+        add_posting(indices["full_text"][key], "artifact", art)
+    
+    # Match theory/event text against location names once, instead of
+    # re-normalizing every record on each location lookup
+    location_keys = list(indices["locations_by_name"])
+    for records, index_name in ((self.theories, "theories_by_location"), (self.events, "events_by_location")):
+      for record in records:
+        norm_text = normalize(record.get("text", ""))
+        for loc_key in location_keys:
+          if loc_key in norm_text:
+            indices[index_name][loc_key].append(record)
+    
+    # Freeze deduplicated full_text postings
+    indices["full_text"] = {key: tuple(postings.values()) for key, postings in indices["full_text"].items()}
+    
+    # Index n-grams of full_text keys so search only verifies keys that
+    # contain every n-gram of the query
+    full_text_keys = list(indices["full_text"])
+    full_text_grams = defaultdict(set)
+    for pos, key in enumerate(full_text_keys):
+      for gram in grams(key):
+        full_text_grams[gram].add(pos)
+    indices["full_text_keys"] = full_text_keys
+    indices["full_text_grams"] = dict(full_text_grams)
     
     return indices
   
+  def _matching_keys(self, q):
+    """Return full_text keys containing q, in index order."""
+    keys = self.indices["full_text_keys"]
+    if len(q) < GRAM_SIZE:
+      return [key for key in keys if q in key]
+    postings = sorted((self.indices["full_text_grams"].get(gram, ()) for gram in grams(q)), key=len)
+    candidates = set(postings[0]).intersection(*postings[1:])
+    return [keys[pos] for pos in sorted(candidates) if q in keys[pos]]
+  
   def search(self, query, limit=10):
     """Full-text search across all entity types."""
+    return self.search_counted(query, limit)[0]
+  
+  def search_counted(self, query, limit=10):
+    """Full-text search returning (results, total hits across all types)."""
     q = normalize(query)
     results = {"episodes": [], "people": [], "theories": [], "events": [], "locations": [], "artifacts": []}
+    total = 0
     
     if not q:
-      return results
+      return results, total
     
-    for key, entities in self.indices["full_text"].items():
-      if q in key:
-        for entity_type, entity in entities[:limit]:
-          if entity_type not in results:
-            results[entity_type] = []
-          if len(results[entity_type]) < limit:
-            results[entity_type].append(entity)
+    for key in self._matching_keys(q):
+      entities = self.indices["full_text"][key]
+      for entity_type, entity in entities[:limit]:
+        if entity_type not in results:
+          results[entity_type] = []
+        if len(results[entity_type]) < limit:
+          results[entity_type].append(entity)
+          total += 1
     
-    return results
+    return results, total
   
   def get_episode_details(self, season, episode):
     """Get all details for a specific episode."""
@@ -202,45 +361,37 @@ class KnowledgeBase:
     if not ep:
       return None
     
-    details = {"episode": ep, "people": [], "theories": [], "events": [], "artifacts": []}
-    
-    for person_rec in self.people:
-      if person_rec.get("season") == str(season) and person_rec.get("episode") == str(episode):
-        details["people"].append(person_rec)
-    
-    for theory_rec in self.theories:
-      if theory_rec.get("season") == str(season) and theory_rec.get("episode") == str(episode):
-        details["theories"].append(theory_rec)
-    
-    for event_rec in self.events:
-      if event_rec.get("season") == str(season) and event_rec.get("episode") == str(episode):
-        details["events"].append(event_rec)
-    
-    return details
+    # Mention datasets store season/episode as strings
+    se_key = (str(season), str(episode))
+    return {
+      "episode": ep,
+      "people": list(self.indices["people_by_episode"].get(se_key, [])),
+      "theories": list(self.indices["theories_by_episode"].get(se_key, [])),
+      "events": list(self.indices["events_by_episode"].get(se_key, [])),
+      "artifacts": []
+    }
   
   def get_location_details(self, location_name):
     """Get all details for a location."""
-    norm_name = normalize(location_name)
+    return self._location_details(normalize(location_name))
+  
+  def get_location_details_for(self, loc):
+    """Get all details for a location record returned by search."""
+    norm_name = self.location_keys.get(id(loc))
+    if norm_name is None:
+      return self.get_location_details(loc.get("name", ""))
+    return self._location_details(norm_name)
+  
+  def _location_details(self, norm_name):
     loc = self.indices["locations_by_name"].get(norm_name)
     
     if not loc:
       return None
     
     details = {"location": loc, "episodes": [], "artifacts": [], "theories": [], "events": []}
-    
-    for art in self.artifacts:
-      if normalize(art.get("location", "")) == norm_name:
-        details["artifacts"].append(art)
-    
-    for theory_rec in self.theories:
-      if normalize(theory_rec.get("text", "")).find(normalize(loc.get("name"))) >= 0:
-        if len(details["theories"]) < 5:
-          details["theories"].append(theory_rec)
-    
-    for event_rec in self.events:
-      if normalize(event_rec.get("text", "")).find(normalize(loc.get("name"))) >= 0:
-        if len(details["events"]) < 5:
-          details["events"].append(event_rec)
+    details["artifacts"] = list(self.indices["artifacts_by_location"].get(norm_name, []))
+    details["theories"] = self.indices["theories_by_location"].get(norm_name, [])[:5]
+    details["events"] = self.indices["events_by_location"].get(norm_name, [])[:5]
     
     return details
   
@@ -258,89 +409,137 @@ class KnowledgeBase:
 
 
 def get_knowledge_base(pi_mode=False):
-  """Get or create knowledge base singleton."""
-  global KNOWLEDGE_BASE
-  if KNOWLEDGE_BASE is None:
-    KNOWLEDGE_BASE = KnowledgeBase(DATA_DIR, pi_mode=pi_mode)
-  return KNOWLEDGE_BASE
+  """Get or create the knowledge base for the given mode."""
+  pi_mode = bool(pi_mode)
+  kb = KNOWLEDGE_BASES.get(pi_mode)
+  if kb is None:
+    with KNOWLEDGE_BASE_LOCK:
+      kb = KNOWLEDGE_BASES.get(pi_mode)
+      if kb is None:
+        kb = KNOWLEDGE_BASES[pi_mode] = KnowledgeBase(DATA_DIR, pi_mode=pi_mode)
+  return kb
+
+
+def warm_knowledge_bases():
+  """Build both mode knowledge bases ahead of the first request."""
+  for pi_mode in (False, True):
+    get_knowledge_base(pi_mode=pi_mode)
+
+
+@lru_cache(maxsize=2048)
+def cached_search(query, pi_mode=False, limit=SEARCH_CACHE_LIMIT):
+  """Memoized limit-hit (results, total); callers must not mutate it."""
+  return get_knowledge_base(pi_mode=pi_mode).search_counted(query, limit=limit)
+
+
+def search_top(query, limit, pi_mode=False):
+  """Search truncated to limit per type, memoized per limit up to SEARCH_CACHE_LIMIT."""
+  if limit > SEARCH_CACHE_LIMIT:
+    return get_knowledge_base(pi_mode=pi_mode).search(query, limit=limit)
+  # Not sliced from a wider cached search: search() cuts each key's postings
+  # at limit, so when a key mixes entity types a narrower search can pick up
+  # entities from later keys that a wider one never reaches
+  return cached_search(query, pi_mode, limit)[0]
 
 
 # ============================================================================
 # SEMANTIC QUERY HANDLER
 # ============================================================================
 
+# Each alternative is a zero-width lookahead tried at position 0 in order,
+# so the first intent (not the leftmost keyword) wins
+INTENT_RE = re.compile(
+  r"(?P<connection>(?=.*?(?:connect|connection|between|relates)))"
+  r"|(?P<summary>(?=summarize|summary|.*?summary))"
+  r"|(?P<timeline>(?=.*?(?:timeline|when|year|history)))"
+  r"|(?P<episode>(?=.*?(?:episode|season)))"
+  r"|(?P<theory>(?=.*?(?:theory|theories|explain)))"
+  r"|(?P<artifact>(?=.*?(?:artifact|artifacts|find|treasure|discover)))"
+  r"|(?P<location>(?=.*?(?:location|where|place|pit|cove|shaft)))"
+  r"|(?P<person>(?=.*?(?:person|people|who|name)))"
+  r"|(?P<event>(?=.*?(?:event|happen)))",
+  re.DOTALL
+)
+
+
+@lru_cache(maxsize=2048)
 def infer_intent(query):
   """Detect user intent from natural language query."""
-  q = normalize(query)
-  
-  if any(word in q for word in ["connect", "connection", "between", "relates"]):
-    return "connection"
-  if q.startswith("summarize") or q.startswith("summary") or "summary" in q:
-    return "summary"
-  if any(word in q for word in ["timeline", "when", "year", "history"]):
-    return "timeline"
-  if any(word in q for word in ["episode", "season"]):
-    return "episode"
-  if any(word in q for word in ["theory", "theories", "explain"]):
-    return "theory"
-  if any(word in q for word in ["artifact", "artifacts", "find", "treasure", "discover"]):
-    return "artifact"
-  if any(word in q for word in ["location", "where", "place", "pit", "cove", "shaft"]):
-    return "location"
-  if any(word in q for word in ["person", "people", "who", "name"]):
-    return "person"
-  if "event" in q or "happen" in q:
-    return "event"
-  
-  return "search"
+  match = INTENT_RE.match(normalize(query))
+  return match.lastgroup if match else "search"
+
+
+def _episode_card(entity):
+  season, episode = entity.get("season"), entity.get("episode")
+  return {
+    "title": f"S{season}E{episode} - {entity.get('title', 'Untitled')}",
+    "type": "episode",
+    "summary": f"Season {season}, Episode {episode}",
+    "data": entity
+  }
+
+
+def _location_card(entity):
+  return {
+    "title": entity.get("name", "Unknown Location"),
+    "type": "location",
+    "summary": f"{entity.get('type', 'Location')} at ({entity.get('lat'):.4f}, {entity.get('lng'):.4f})",
+    "data": entity
+  }
+
+
+def _artifact_card(entity):
+  return {
+    "title": entity.get("name", "Unknown Artifact"),
+    "type": "artifact",
+    "summary": f"Found at {entity.get('location', 'Unknown')}",
+    "data": entity.get("raw", entity)
+  }
+
+
+def _person_card(entity):
+  return {
+    "title": entity.get("person", "Unknown"),
+    "type": "person",
+    "summary": "Person mentioned in series",
+    "data": entity
+  }
+
+
+def _theory_card(entity):
+  return {
+    "title": entity.get("theory", "Unknown Theory"),
+    "type": "theory",
+    "summary": entity.get("text", "")[:100],
+    "data": entity
+  }
+
+
+def _event_card(entity):
+  return {
+    "title": entity.get("event_type", "Event"),
+    "type": "event",
+    "summary": entity.get("text", "")[:100],
+    "data": entity
+  }
+
+
+CARD_BUILDERS = {
+  "episode": _episode_card,
+  "location": _location_card,
+  "artifact": _artifact_card,
+  "person": _person_card,
+  "theory": _theory_card,
+  "event": _event_card
+}
 
 
 def build_entity_card(entity_type, entity, kb):
   """Build a rich card for an entity."""
-  if entity_type == "episode":
-    return {
-      "title": f"S{entity.get('season')}E{entity.get('episode')} - {entity.get('title', 'Untitled')}",
-      "type": "episode",
-      "summary": f"Season {entity.get('season')}, Episode {entity.get('episode')}",
-      "data": entity
-    }
-  elif entity_type == "location":
-    return {
-      "title": entity.get("name", "Unknown Location"),
-      "type": "location",
-      "summary": f"{entity.get('type', 'Location')} at ({entity.get('lat'):.4f}, {entity.get('lng'):.4f})",
-      "data": entity
-    }
-  elif entity_type == "artifact":
-    return {
-      "title": entity.get("name", "Unknown Artifact"),
-      "type": "artifact",
-      "summary": f"Found at {entity.get('location', 'Unknown')}",
-      "data": entity.get("raw", entity)
-    }
-  elif entity_type == "person":
-    return {
-      "title": entity.get("person", "Unknown"),
-      "type": "person",
-      "summary": f"Person mentioned in series",
-      "data": entity
-    }
-  elif entity_type == "theory":
-    return {
-      "title": entity.get("theory", "Unknown Theory"),
-      "type": "theory",
-      "summary": entity.get("text", "")[:100],
-      "data": entity
-    }
-  elif entity_type == "event":
-    return {
-      "title": entity.get("event_type", "Event"),
-      "type": "event",
-      "summary": entity.get("text", "")[:100],
-      "data": entity
-    }
-  
-  return {"title": str(entity), "type": entity_type, "data": entity}
+  builder = CARD_BUILDERS.get(entity_type)
+  if builder is None:
+    return {"title": str(entity), "type": entity_type, "data": entity}
+  return builder(entity)
 
 
 def semantic_query_handler(query, pi_mode=False):
@@ -368,11 +567,11 @@ def semantic_query_handler(query, pi_mode=False):
   # LOCATION INTENT
   if intent == "location":
     terms = query.replace("where", "").replace("location", "").strip()
-    results = kb.search(terms, limit=3)
+    results = search_top(terms, 3, pi_mode)
     
     if results.get("locations"):
       loc = results["locations"][0]
-      details = kb.get_location_details(loc.get("name", ""))
+      details = kb.get_location_details_for(loc)
       response["title"] = loc.get("name", "Unknown Location")
       response["summary"] = f"Location: {loc.get('name')}. Type: {loc.get('type')}."
       response["entities"] = [build_entity_card("location", loc, kb)]
@@ -386,8 +585,7 @@ def semantic_query_handler(query, pi_mode=False):
   
   # EPISODE INTENT
   elif intent == "episode":
-    import re as regex
-    match = regex.search(r"s(\d+)e(\d+)|season\s+(\d+).*episode\s+(\d+)", query, regex.IGNORECASE)
+    match = SEASON_EPISODE_RE.search(query)
     if match:
       season = match.group(1) or match.group(3)
       episode = match.group(2) or match.group(4)
@@ -404,7 +602,7 @@ def semantic_query_handler(query, pi_mode=False):
           "theories_discussed": len(details.get("theories", []))
         }
     else:
-      results = kb.search(query, limit=5)
+      results = search_top(query, 5, pi_mode)
       if results.get("episodes"):
         response["title"] = "Episode Search Results"
         response["summary"] = f"Found {len(results['episodes'])} matching episodes"
@@ -412,7 +610,7 @@ def semantic_query_handler(query, pi_mode=False):
   
   # ARTIFACT INTENT
   elif intent == "artifact":
-    results = kb.search(query, limit=5)
+    results = search_top(query, 5, pi_mode)
     if results.get("artifacts"):
       response["title"] = "Artifact Search"
       response["summary"] = f"Found {len(results['artifacts'])} matching artifacts"
@@ -422,7 +620,7 @@ def semantic_query_handler(query, pi_mode=False):
   
   # PERSON INTENT
   elif intent == "person":
-    results = kb.search(query, limit=3)
+    results = search_top(query, 3, pi_mode)
     if results.get("people"):
       response["title"] = "Person Search"
       response["summary"] = f"Found {len(results['people'])} mentions"
@@ -436,7 +634,7 @@ def semantic_query_handler(query, pi_mode=False):
       response["summary"] = "Theories are not available in PI_MODE. Switch to WEB_MODE for full semantic analysis."
       response["mode"] = "PI_MODE (limited)"
     else:
-      results = kb.search(query, limit=5)
+      results = search_top(query, 5, pi_mode)
       if results.get("theories"):
         response["title"] = "Theory Search"
         response["summary"] = f"Found {len(results['theories'])} theory mentions"
@@ -447,7 +645,7 @@ def semantic_query_handler(query, pi_mode=False):
   # SUMMARY INTENT
   elif intent == "summary":
     query_clean = query.replace("summarize", "").strip()
-    results = kb.search(query_clean, limit=15)
+    results = search_top(query_clean, 15, pi_mode)
     response["title"] = f"Summary: {query_clean}"
     response["summary"] = f"Comprehensive information about '{query_clean}':"
     
@@ -460,7 +658,7 @@ def semantic_query_handler(query, pi_mode=False):
   
   # TIMELINE INTENT
   elif intent == "timeline":
-    results = kb.search(query, limit=15)
+    results = search_top(query, 15, pi_mode)
     if results.get("episodes"):
       episodes = sorted(results["episodes"], key=lambda e: (int(e.get("season", 0)), int(e.get("episode", 0))))
       response["title"] = "Timeline"
@@ -469,7 +667,7 @@ def semantic_query_handler(query, pi_mode=False):
   
   # DEFAULT: SEARCH
   else:
-    results = kb.search(query, limit=20)
+    results, total = cached_search(query, pi_mode, SEARCH_CACHE_LIMIT)
     response["title"] = "Search Results"
     all_entities = []
     
@@ -479,7 +677,7 @@ def semantic_query_handler(query, pi_mode=False):
           all_entities.append(build_entity_card(entity_type[:-1], entity, kb))
     
     response["entities"] = all_entities[:10]
-    response["summary"] = f"Found {sum(len(v) for v in results.values())} results across all datasets"
+    response["summary"] = f"Found {total} results across all datasets"
   
   return response
 
@@ -497,17 +695,19 @@ def root():
 def api_search():
   """General search endpoint."""
   query = request.args.get("q", "")
-  limit = int(request.args.get("limit", "20"))
+  try:
+    limit = int(request.args.get("limit") or "20")
+  except ValueError:
+    return json_response({"error": "limit must be an integer"}, status=400)
   pi_mode = request.args.get("piMode", "").lower() in {"1", "true", "yes"}
   
   kb = get_knowledge_base(pi_mode=pi_mode)
-  results = kb.search(query, limit=limit)
   
-  return jsonify({
+  return conditional_response(kb, lambda: json_response({
     "query": query,
     "piMode": pi_mode,
-    "results": results
-  })
+    "results": kb.search(query, limit=limit)
+  }))
 
 
 @app.get("/api/episodes")
@@ -515,12 +715,12 @@ def api_episodes():
   """Search episodes."""
   query = request.args.get("q", "")
   kb = get_knowledge_base(pi_mode=False)
-  results = kb.search(query, limit=30) if query else {"episodes": kb.episodes[:30]}
   
-  return jsonify({
-    "query": query,
-    "episodes": results.get("episodes", [])
-  })
+  def build_response():
+    results = kb.search(query, limit=30) if query else {"episodes": kb.episodes[:30]}
+    return stream_json_response({"query": query}, "episodes", results.get("episodes", []))
+  
+  return conditional_response(kb, build_response)
 
 
 @app.get("/api/locations")
@@ -528,12 +728,12 @@ def api_locations():
   """Search locations."""
   query = request.args.get("q", "")
   kb = get_knowledge_base(pi_mode=False)
-  results = kb.search(query, limit=30) if query else {"locations": kb.locations[:30]}
   
-  return jsonify({
-    "query": query,
-    "locations": results.get("locations", [])
-  })
+  def build_response():
+    results = kb.search(query, limit=30) if query else {"locations": kb.locations[:30]}
+    return stream_json_response({"query": query}, "locations", results.get("locations", []))
+  
+  return conditional_response(kb, build_response)
 
 
 @app.get("/api/theories")
@@ -541,7 +741,7 @@ def api_theories():
   """Search theories (WEB_MODE only)."""
   pi_mode = request.args.get("piMode", "").lower() in {"1", "true", "yes"}
   if pi_mode:
-    return jsonify({
+    return json_response({
       "query": request.args.get("q", ""),
       "theories": [],
       "note": "Theories disabled in PI_MODE"
@@ -549,12 +749,12 @@ def api_theories():
   
   query = request.args.get("q", "")
   kb = get_knowledge_base(pi_mode=False)
-  results = kb.search(query, limit=30) if query else {"theories": kb.theories[:30]}
   
-  return jsonify({
-    "query": query,
-    "theories": results.get("theories", [])
-  })
+  def build_response():
+    results = kb.search(query, limit=30) if query else {"theories": kb.theories[:30]}
+    return stream_json_response({"query": query}, "theories", results.get("theories", []))
+  
+  return conditional_response(kb, build_response)
 
 
 @app.get("/api/people")
@@ -562,7 +762,7 @@ def api_people():
   """Search people (WEB_MODE only)."""
   pi_mode = request.args.get("piMode", "").lower() in {"1", "true", "yes"}
   if pi_mode:
-    return jsonify({
+    return json_response({
       "query": request.args.get("q", ""),
       "people": [],
       "note": "People disabled in PI_MODE"
@@ -570,12 +770,12 @@ def api_people():
   
   query = request.args.get("q", "")
   kb = get_knowledge_base(pi_mode=False)
-  results = kb.search(query, limit=30) if query else {"people": kb.people[:30]}
   
-  return jsonify({
-    "query": query,
-    "people": results.get("people", [])
-  })
+  def build_response():
+    results = kb.search(query, limit=30) if query else {"people": kb.people[:30]}
+    return stream_json_response({"query": query}, "people", results.get("people", []))
+  
+  return conditional_response(kb, build_response)
 
 
 @app.get("/api/events")
@@ -583,7 +783,7 @@ def api_events():
   """Search events (WEB_MODE only)."""
   pi_mode = request.args.get("piMode", "").lower() in {"1", "true", "yes"}
   if pi_mode:
-    return jsonify({
+    return json_response({
       "query": request.args.get("q", ""),
       "events": [],
       "note": "Events disabled in PI_MODE"
@@ -591,12 +791,12 @@ def api_events():
   
   query = request.args.get("q", "")
   kb = get_knowledge_base(pi_mode=False)
-  results = kb.search(query, limit=30) if query else {"events": kb.events[:30]}
   
-  return jsonify({
-    "query": query,
-    "events": results.get("events", [])
-  })
+  def build_response():
+    results = kb.search(query, limit=30) if query else {"events": kb.events[:30]}
+    return stream_json_response({"query": query}, "events", results.get("events", []))
+  
+  return conditional_response(kb, build_response)
 
 
 @app.post("/api/semantic/query")
@@ -608,8 +808,9 @@ def api_semantic_query():
   
   response = semantic_query_handler(query, pi_mode=pi_mode)
   
-  return jsonify(response)
+  return json_response(response)
 
 
 if __name__ == "__main__":
+  threading.Thread(target=warm_knowledge_bases, daemon=True).start()
   app.run(host="0.0.0.0", port=8080, debug=False)
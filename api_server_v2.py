@@ -14,7 +14,7 @@ Provides efficient querying of:
 - Measurements (2,758 scientific measurements)
 
 Features:
-  ✓ Zero external dependencies (stdlib only)
+  ✓ Minimal dependencies: Flask and orjson (msgpack, brotli optional)
   ✓ CORS support for browser access
   ✓ Automatic fallback to JSON files if DB unavailable
   ✓ Pagination and filtering
@@ -22,23 +22,49 @@ Features:
   ✓ Comprehensive error handling
 
 Usage:
-    python3 api_server_v2.py                      # Production (localhost:5000)
+    gunicorn -k gthread -w 2 --threads 8 -b 0.0.0.0:5000 wsgi:app   # Production
+    python3 api_server_v2.py                      # waitress, 8 threads (localhost:5000)
     python3 api_server_v2.py --dev --port 8000   # Development mode
 
 Environment:
     DATABASE_PATH=./oak_island_hub.db   Override database location
     FLASK_ENV=development               Enable debug logging
+    USE_X_SENDFILE=1                    Hand static files to the front proxy
+    CACHE_INVALIDATE_TOKEN=<secret>     Enable POST /api/v2/_cache/invalidate (X-Cache-Token header)
 """
 
-from flask import Flask, request, jsonify, send_from_directory, make_response
+from flask import Flask, request, send_file, make_response, stream_with_context
+from flask.json.provider import JSONProvider
 from pathlib import Path
 import sqlite3
 import json
+import orjson
 import logging
 import argparse
-from typing import Optional, Dict, List, Any, Tuple
+import os
+import sys
+from typing import Optional, Dict, List, Any, Tuple, Iterable, Iterator
 from urllib.parse import quote_plus
 import threading
+import base64
+import hashlib
+import hmac
+import time
+import gzip
+import zlib
+from functools import wraps, lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import msgpack  # Optional: enables Accept: application/msgpack on bulk endpoints
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli  # Optional: adds a br variant to cached responses
+except ImportError:
+    brotli = None
+from itertools import islice
 
 # ============================================================================
 # CONFIGURATION
@@ -54,13 +80,60 @@ BASE_DIR = Path(__file__).resolve().parent
 APP_DIR = BASE_DIR / "docs"
 DATA_DIR = APP_DIR / "data"
 DB_PATH = BASE_DIR / "oak_island_hub.db"  # Semantic database path
+CATALOG_CACHE_TIMEOUT = 3600  # Seconds to keep catalog responses
+RESPONSE_CACHE_MAXSIZE = 256  # Cached responses kept; oldest go first when full
+STATEMENT_CACHE_SIZE = 256  # Compiled statements kept per connection
+COMPRESS_MIN_SIZE = 1024  # Smallest JSON body worth gzipping
+COMPRESS_LEVEL = 5
+BROTLI_QUALITY = 5
+STREAM_BATCH_ROWS = 100  # Rows serialized per chunk of a streamed response
+SERVER_THREADS = 8  # waitress worker threads when run directly
+SEARCH_WORKERS = 4  # One per entity table queried by /api/v2/search
+STATUS_COUNTS_TIMEOUT = 30  # Seconds to reuse the row counts in /api/status
+STATUS_CACHE_TIMEOUT = 10  # Seconds to keep the serialized /api/status response
+STATIC_MAX_AGE = 3600  # Browser cache lifetime for files under docs/
+CACHE_INVALIDATE_TOKEN = os.environ.get('CACHE_INVALIDATE_TOKEN', '')  # Unset disables cache invalidation
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (sqlite3.Row serializes as a dict)."""
+
+    @staticmethod
+    def default(obj: Any) -> Any:
+        if isinstance(obj, sqlite3.Row):
+            return dict(obj)
+        return str(obj)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype='application/json')
+
+class StaticApp(Flask):
+    """Flask app that caches docs/ assets but always revalidates index.html."""
 
-app = Flask(__name__, static_folder=str(APP_DIR), static_url_path="")
+    def get_send_file_max_age(self, filename: Optional[str]) -> Optional[int]:
+        if filename and os.path.basename(filename) == 'index.html':
+            return 0  # SPA entry point: pick up new deploys immediately
+        return super().get_send_file_max_age(filename)
+
+app = StaticApp(__name__, static_folder=str(APP_DIR), static_url_path="")
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE
+app.json = OrjsonProvider(app)
+# Behind nginx/Apache, let the proxy stream static files via X-Sendfile
+app.use_x_sendfile = os.environ.get('USE_X_SENDFILE') == '1'
+APP_DIR_PREFIX = str(APP_DIR) + os.sep
+INDEX_HTML = str(APP_DIR / 'index.html')
 
 # ============================================================================
 # DATABASE MANAGER
 # ============================================================================
 
+class SemanticDB:
     """Manages connections to semantic SQLite database with fallback to JSON."""
 
     def __init__(self, db_path: Path):
@@ -68,20 +141,23 @@ app = Flask(__name__, static_folder=str(APP_DIR), static_url_path="")
         self.available = False
         self.json_cache = {}
         self._cache_lock = threading.Lock()
+        self._local = threading.local()
+        self.name_search = False
 
         # Check if database exists
         if db_path.exists():
             try:
-                conn = sqlite3.connect(str(db_path))
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
+                cursor = self._get_conn().execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
                 table_count = cursor.fetchone()[0]
-                conn.close()
 
                 if table_count > 0:
                     self.available = True
                     logger.info(f"✓ Semantic database available: {db_path}")
+                    cursor = self._get_conn().execute("""
+                        SELECT COUNT(*) FROM sqlite_master
+                        WHERE name IN ('locations_fts', 'theories_fts', 'people_fts', 'artifacts_fts')
+                    """)
+                    self.name_search = cursor.fetchone()[0] == 4
                 else:
                     logger.warning(f"✗ Database has no tables: {db_path}")
             except Exception as e:
@@ -89,46 +165,97 @@ app = Flask(__name__, static_folder=str(APP_DIR), static_url_path="")
         else:
             logger.warning(f"✗ Database not found: {db_path}")
     
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-20000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+        return conn
+
+    def release(self) -> None:
+        """Roll back any transaction left open on this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
+
     def query_one(self, sql: str, params: Tuple = ()) -> Optional[Dict]:
         """Execute query and return single result as dict."""
         if not self.available:
             return None
         
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(sql, params)
+            cursor = self._get_conn().execute(sql, params)
             row = cursor.fetchone()
-            conn.close()
             return dict(row) if row else None
         except Exception as e:
             logger.error(f"Query error: {e}")
             return None
     
+    def query_iter(self, sql: str, params: Tuple = ()) -> Optional[sqlite3.Cursor]:
+        """Execute query and return the live cursor so rows can be streamed."""
+        if not self.available:
+            return None
+        
+        try:
+            return self._get_conn().execute(sql, params)
+        except Exception as e:
+            logger.error(f"Query error: {e}")
+            return None
+    
+    def query_rows(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        """Execute query and return the raw rows, for results serialized as-is.
+        
+        OrjsonProvider.default turns each Row into an object at encode time,
+        so read-only endpoints skip building an intermediate dict per row.
+        """
+        if not self.available:
+            return []
+        
+        try:
+            return self._get_conn().execute(sql, params).fetchall()
+        except Exception as e:
+            logger.error(f"Query error: {e}")
+            return []
+    
     def query_all(self, sql: str, params: Tuple = ()) -> List[Dict]:
         """Execute query and return results as list of dicts."""
         if not self.available:
             return []
         
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(sql, params)
-            results = [dict(row) for row in cursor.fetchall()]
-            conn.close()
-            return results
+            cursor = self._get_conn().execute(sql, params)
+            return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Query error: {e}")
             return []
 
 db = SemanticDB(DB_PATH)
 
+@app.teardown_appcontext
+def release_db(exception=None):
+    """Keep the pooled connection open; just make sure it is left idle."""
+    db.release()
+
+# Search fans its per-table queries out here; each worker thread gets its own
+# read-only connection from SemanticDB._get_conn().
+SEARCH_POOL = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix='search')
+
 # ============================================================================
 # JSON FALLBACK HELPERS
 # ============================================================================
 
+def load_json_slice(filename: str) -> Optional[Any]:
     """Load optimized JSON slice with caching (thread-safe)."""
     cache_key = f"slice_{filename}"
     with db._cache_lock:
@@ -150,6 +277,226 @@ db = SemanticDB(DB_PATH)
         logger.warning(f"Failed to load {filename}: {e}")
         return None
 
+EVENT_FILTERS = ('location_id', 'season', 'episode')
+
+def load_event_index() -> Optional[Dict[str, Any]]:
+    """Load events.json once, ordered like the DB, with row positions per filter value."""
+    with db._cache_lock:
+        if 'event_index' in db.json_cache:
+            return db.json_cache['event_index']
+
+    data = load_json_slice("events")
+    if not isinstance(data, list):
+        return None
+
+    events = []
+    for e in data:
+        try:
+            events.append({
+                'season': int(e.get('season')),
+                'episode': int(e.get('episode')),
+                'timestamp': e.get('timestamp'),
+                'event_type': e.get('event_type'),
+                'text': e.get('text'),
+                'confidence': float(e.get('confidence', 1.0)),
+                'location_id': e.get('location_id')
+            })
+        except (TypeError, ValueError):
+            continue
+    events.sort(key=lambda e: (e['season'], e['episode'], e['timestamp'] or ''))
+
+    positions = {field: {} for field in EVENT_FILTERS}
+    for i, e in enumerate(events):
+        for field in EVENT_FILTERS:
+            if e[field] is not None:
+                positions[field].setdefault(str(e[field]), []).append(i)
+
+    index = {
+        'events': [{k: v for k, v in e.items() if k != 'location_id'} for e in events],
+        'positions': positions
+    }
+    with db._cache_lock:
+        db.json_cache['event_index'] = index
+    return index
+
+# ============================================================================
+# RESPONSE HELPERS
+# ============================================================================
+
+def json_response(payload: Any, status: int = 200):
+    """Serialize payload with orjson into a JSON response."""
+    return app.response_class(orjson.dumps(payload, default=OrjsonProvider.default), status=status, mimetype='application/json')
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+def wants_msgpack() -> bool:
+    """Whether the client prefers msgpack over JSON (and msgpack is installed)."""
+    if msgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE])
+    return best == MSGPACK_MIMETYPE
+
+def negotiated_response(payload: Any, status: int = 200):
+    """Serialize payload as msgpack or JSON, following the Accept header."""
+    if wants_msgpack():
+        response = app.response_class(
+            msgpack.packb(payload, default=OrjsonProvider.default, use_bin_type=True),
+            status=status, mimetype=MSGPACK_MIMETYPE
+        )
+    else:
+        response = json_response(payload, status)
+    response.vary.add('Accept')
+    return response
+
+def accepts_gzip() -> bool:
+    """Whether the client accepts gzip-encoded responses."""
+    return request.accept_encodings['gzip'] > 0
+
+def gzip_body(body: bytes) -> Optional[bytes]:
+    """Gzip a body large enough to benefit, else return None."""
+    if len(body) < COMPRESS_MIN_SIZE:
+        return None
+    return gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+
+def accepts_brotli() -> bool:
+    """Whether brotli is installed and the client accepts br-encoded responses."""
+    return brotli is not None and request.accept_encodings['br'] > 0
+
+def brotli_body(body: bytes) -> Optional[bytes]:
+    """Brotli-compress a body large enough to benefit, if brotli is installed."""
+    if brotli is None or len(body) < COMPRESS_MIN_SIZE:
+        return None
+    return brotli.compress(body, quality=BROTLI_QUALITY)
+
+def json_array_chunks(rows: Iterable[Any]) -> Iterator[bytes]:
+    """Yield rows as a JSON array, serializing STREAM_BATCH_ROWS at a time."""
+    yield b'['
+    rows = iter(rows)
+    separator = b''
+    while True:
+        batch = list(islice(rows, STREAM_BATCH_ROWS))
+        if not batch:
+            break
+        yield separator + orjson.dumps(batch, default=OrjsonProvider.default)[1:-1]
+        separator = b','
+    yield b']'
+
+def gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip a chunk stream on the fly."""
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def stream_json_response(chunks: Iterator[bytes]):
+    """Stream JSON chunks, gzipped for clients that accept it."""
+    if accepts_gzip():
+        response = app.response_class(stream_with_context(gzip_chunks(chunks)), mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+    return app.response_class(stream_with_context(chunks), mimetype='application/json')
+
+@app.after_request
+def compress_response(response):
+    """Gzip JSON responses for clients that accept it."""
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.mimetype != 'application/json'
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or not accepts_gzip()):
+        return response
+    compressed = gzip_body(response.get_data())
+    if compressed is not None:
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+# ============================================================================
+# PAGINATION HELPERS
+# ============================================================================
+
+MAX_PAGE_SIZE = 1000
+MAX_OFFSET = 1_000_000
+
+def int_arg(name: str, default: int, lo: int, hi: int) -> int:
+    """Read an integer query parameter clamped to [lo, hi], or default if unparseable."""
+    try:
+        value = int(request.args.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    return max(lo, min(hi, value))
+
+def encode_cursor(values: Tuple) -> str:
+    """Encode a row's sort key as an opaque ?after= cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str, size: int) -> Optional[Tuple]:
+    """Decode an ?after= cursor, or return None if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return tuple(values)
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+_response_cache: Dict[str, Tuple[float, bytes, Optional[bytes], Optional[bytes], int, str, str]] = {}
+_response_cache_lock = threading.Lock()
+
+def cached_response(timeout: int = CATALOG_CACHE_TIMEOUT, vary_args: Tuple[str, ...] = ()):
+    """Cache a view's serialized (plus gzip and br) body per path and answer repeats with ETag/304.
+    
+    Only the query args named in vary_args (the ones the view reads) go into
+    the key, so unrelated args such as ?junk=N never mint new entries.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.path
+            for name in vary_args:
+                key += f"&{name}={request.args.get(name, '')}"
+            if wants_msgpack():
+                key += '#msgpack'
+            now = time.monotonic()
+            with _response_cache_lock:
+                entry = _response_cache.get(key)
+            if entry is None or entry[0] <= now:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+                entry = (now + timeout, body, gzip_body(body), brotli_body(body),
+                         response.status_code, response.mimetype, etag)
+                with _response_cache_lock:
+                    _response_cache.pop(key, None)
+                    while len(_response_cache) >= RESPONSE_CACHE_MAXSIZE:
+                        del _response_cache[next(iter(_response_cache))]
+                    _response_cache[key] = entry
+            _, body, gzipped, brotlied, status, mimetype, etag = entry
+            if brotlied is not None and accepts_brotli():
+                response = app.response_class(brotlied, status=status, mimetype=mimetype)
+                response.headers['Content-Encoding'] = 'br'
+                etag += '-br'
+            elif gzipped is not None and accepts_gzip():
+                response = app.response_class(gzipped, status=status, mimetype=mimetype)
+                response.headers['Content-Encoding'] = 'gzip'
+                etag += '-gzip'
+            else:
+                response = app.response_class(body, status=status, mimetype=mimetype)
+            response.vary.add('Accept')
+            response.set_etag(etag)
+            response.cache_control.public = True
+            response.cache_control.max_age = timeout
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
 # ============================================================================
 # CORS MIDDLEWARE
 # ============================================================================
@@ -158,32 +505,33 @@ db = SemanticDB(DB_PATH)
 # If you need to restrict CORS in production, set allowed_origins accordingly.
 ALLOWED_ORIGINS = None  # Set to a list of allowed origins to restrict
 
+CORS_HEADERS = (
+    ("Access-Control-Allow-Headers", "Content-Type, Authorization"),
+    ("Access-Control-Allow-Methods", "GET, OPTIONS"),
+    ("Vary", "Origin"),
+)
+
+def cors_origin() -> str:
+    """Return the origin to echo back, or "null" if it is not allowed."""
+    origin = request.headers.get("Origin", "*")
+    # If ALLOWED_ORIGINS is set, restrict CORS
+    if ALLOWED_ORIGINS is not None and origin not in ALLOWED_ORIGINS:
+        return "null"
+    return origin
+
 @app.before_request
 def handle_preflight():
-    """Handle CORS preflight requests (OPTIONS)."""
+    """Handle CORS preflight requests (OPTIONS); add_cors_headers fills in the rest."""
     if request.method == "OPTIONS":
-        origin = request.headers.get("Origin", "*")
-        # If ALLOWED_ORIGINS is set, restrict CORS
-        if ALLOWED_ORIGINS is not None and origin not in ALLOWED_ORIGINS:
-            origin = "null"
-        response = make_response("", 204)
-        response.headers.add("Access-Control-Allow-Origin", origin)
-        response.headers.add("Access-Control-Allow-Headers", "Content-Type, Authorization")
-        response.headers.add("Access-Control-Allow-Methods", "GET, OPTIONS")
-        response.headers.add("Access-Control-Max-Age", "3600")
+        response = app.response_class(status=204)
+        response.headers["Access-Control-Max-Age"] = "3600"
         return response
 
 @app.after_request
 def add_cors_headers(response):
     """Add CORS headers to all responses."""
-    origin = request.headers.get("Origin", "*")
-    # If ALLOWED_ORIGINS is set, restrict CORS
-    if ALLOWED_ORIGINS is not None and origin not in ALLOWED_ORIGINS:
-        origin = "null"
-    response.headers.add("Access-Control-Allow-Origin", origin)
-    response.headers.add("Access-Control-Allow-Headers", "Content-Type, Authorization")
-    response.headers.add("Access-Control-Allow-Methods", "GET, OPTIONS")
-    response.headers.add("Vary", "Origin")
+    response.headers.add("Access-Control-Allow-Origin", cors_origin())
+    response.headers.extend(CORS_HEADERS)
     return response
 
 # ============================================================================
@@ -191,6 +539,7 @@ def add_cors_headers(response):
 # ============================================================================
 
 @app.route('/api/v2/locations', methods=['GET'])
+@cached_response()
 def get_locations():
     """Get all locations (minimal data for map initialization).
     
@@ -205,15 +554,87 @@ def get_locations():
     """
     if not db.available:
         data = load_json_slice("locations_min")
-        return jsonify(data or [])
+        return json_response(data or [])
     
-    locations = db.query_all("""
+    locations = db.query_rows("""
         SELECT id, name, type, latitude as lat, longitude as lng
         FROM locations
         ORDER BY name
     """)
     
-    return jsonify(locations)
+    return json_response(locations)
+
+# Location rows with their related events, artifacts and measurements nested
+# as JSON arrays by SQLite, so one statement serves any number of locations
+LOCATION_DETAIL_SQL = """
+    SELECT l.id, l.name, l.type, l.latitude as lat, l.longitude as lng,
+        (SELECT json_group_array(json_object(
+            'season', season, 'episode', episode, 'timestamp', timestamp,
+            'event_type', event_type, 'text', text))
+         FROM (SELECT season, episode, timestamp, event_type, text
+               FROM events
+               WHERE location_id = l.id
+               LIMIT 100)) as events,
+        (SELECT json_group_array(json_object(
+            'id', id, 'name', name, 'type', type, 'season', season,
+            'episode', episode, 'confidence', confidence))
+         FROM (SELECT id, name, artifact_type as type, season, episode, confidence
+               FROM artifacts
+               WHERE location_id = l.id
+               LIMIT 50)) as artifacts,
+        (SELECT json_group_array(json_object(
+            'measurement_type', measurement_type, 'value', value, 'unit', unit,
+            'season', season, 'episode', episode))
+         FROM (SELECT measurement_type, value, unit, season, episode
+               FROM measurements
+               WHERE location_id = l.id
+               LIMIT 100)) as measurements
+    FROM locations l
+    WHERE l.id IN ({placeholders})
+"""
+MAX_BATCH_IDS = 50
+
+def fetch_location_details(location_ids: List[str]) -> Dict[str, Dict]:
+    """Fetch detail documents for the given locations, keyed by id."""
+    placeholders = ",".join("?" * len(location_ids))
+    locations = db.query_all(LOCATION_DETAIL_SQL.format(placeholders=placeholders), tuple(location_ids))
+    for location in locations:
+        for key in ('events', 'artifacts', 'measurements'):
+            location[key] = orjson.loads(location[key])
+    return {location['id']: location for location in locations}
+
+@app.route('/api/v2/locations/batch', methods=['GET'])
+def get_location_batch():
+    """Get several locations with their related rows in one request.
+    
+    Query Parameters:
+        ids: Comma-separated location IDs (max 50)
+    
+    Returns:
+        [{
+            "id": "money_pit",
+            "name": "Money Pit",
+            ...
+            "events": [...],
+            "artifacts": [...],
+            "measurements": [...]
+        }, ...]
+    
+    Unknown IDs are skipped; results follow the requested order.
+    """
+    location_ids = list(dict.fromkeys(i for i in request.args.get('ids', '').split(',') if i))
+    if not location_ids:
+        return json_response({'error': 'ids is required'}), 400
+    if len(location_ids) > MAX_BATCH_IDS:
+        return json_response({'error': f'At most {MAX_BATCH_IDS} ids per request'}), 400
+    
+    if not db.available:
+        data = load_json_slice("locations_min")
+        by_id = {loc.get('id'): loc for loc in (data or [])}
+    else:
+        by_id = fetch_location_details(location_ids)
+    
+    return json_response([by_id[i] for i in location_ids if i in by_id])
 
 @app.route('/api/v2/locations/<location_id>', methods=['GET'])
 def get_location_detail(location_id: str):
@@ -238,50 +659,21 @@ def get_location_detail(location_id: str):
         data = load_json_slice("locations_min")
         for loc in (data or []):
             if loc.get('id') == location_id:
-                return jsonify(loc)
-        return jsonify({'error': 'Location not found'}), 404
-    
-    # Get location
-    location = db.query_one("""
-        SELECT id, name, type, latitude as lat, longitude as lng
-        FROM locations
-        WHERE id = ?
-    """, (location_id,))
+                return json_response(loc)
+        return json_response({'error': 'Location not found'}), 404
     
+    location = fetch_location_details([location_id]).get(location_id)
     if not location:
-        return jsonify({'error': 'Location not found'}), 404
-    
-    # Get related events
-    location['events'] = db.query_all("""
-        SELECT season, episode, timestamp, event_type, text
-        FROM events
-        WHERE location_id = ?
-        LIMIT 100
-    """, (location_id,))
-    
-    # Get related artifacts
-    location['artifacts'] = db.query_all("""
-        SELECT id, name, artifact_type as type, season, episode, confidence
-        FROM artifacts
-        WHERE location_id = ?
-        LIMIT 50
-    """, (location_id,))
-    
-    # Get related measurements
-    location['measurements'] = db.query_all("""
-        SELECT measurement_type, value, unit, season, episode
-        FROM measurements
-        WHERE location_id = ?
-        LIMIT 100
-    """, (location_id,))
+        return json_response({'error': 'Location not found'}), 404
     
-    return jsonify(location)
+    return json_response(location)
 
 # ============================================================================
 # API ENDPOINTS: EPISODES
 # ============================================================================
 
 @app.route('/api/v2/episodes', methods=['GET'])
+@cached_response(vary_args=('season',))
 def get_episodes():
     """Get episodes, optionally filtered by season.
     
@@ -303,24 +695,24 @@ def get_episodes():
         data = load_json_slice("episodes_list")
         if season and data and isinstance(data, dict):
             season_data = data.get(f"season_{season}")
-            return jsonify(season_data or [])
-        return jsonify(data or {})
+            return json_response(season_data or [])
+        return json_response(data or {})
     
     if season:
-        episodes = db.query_all("""
+        episodes = db.query_rows("""
             SELECT id, season, episode, title, air_date
             FROM episodes
             WHERE season = ?
             ORDER BY episode
         """, (int(season),))
     else:
-        episodes = db.query_all("""
+        episodes = db.query_rows("""
             SELECT id, season, episode, title, air_date
             FROM episodes
             ORDER BY season, episode
         """)
     
-    return jsonify(episodes)
+    return json_response(episodes)
 
 # ============================================================================
 # API ENDPOINTS: EVENTS
@@ -335,55 +727,126 @@ def get_events():
         season: Filter by season
         episode: Filter by episode
         limit: Results per page (default 100, max 1000)
-        offset: Pagination offset (default 0)
+        after: Cursor from a previous page's next_cursor
+        offset: Pagination offset (deprecated, ignored when after is given)
     
     Returns:
         {
             "total": 6216,
             "count": 100,
-            "events": [...]
+            "events": [...],
+            "next_cursor": "..."
         }
     """
-    if not db.available:
-        return jsonify({'events': [], 'count': 0, 'total': 0})
-    
-    limit = min(int(request.args.get('limit', 100)), 1000)
-    offset = int(request.args.get('offset', 0))
-    
-    where_clause = "WHERE 1=1"
-    params = []
-    
-    if request.args.get('location_id'):
-        where_clause += " AND location_id = ?"
-        params.append(request.args.get('location_id'))
-    
-    if request.args.get('season'):
-        where_clause += " AND season = ?"
-        params.append(int(request.args.get('season')))
-    
-    if request.args.get('episode'):
-        where_clause += " AND episode = ?"
-        params.append(int(request.args.get('episode')))
-    
-    # Count total
-    count_result = db.query_one(f"SELECT COUNT(*) as total FROM events {where_clause}", tuple(params))
-    total = count_result['total'] if count_result else 0
+    limit = int_arg('limit', 100, 1, MAX_PAGE_SIZE)
+    offset = int_arg('offset', 0, 0, MAX_OFFSET)
     
-    # Get paginated results
-    params_with_limit = params + [limit, offset]
-    events = db.query_all(f"""
-        SELECT season, episode, timestamp, event_type, text, confidence
+    if not db.available:
+        return get_events_from_json(limit, offset)
+    
+    filters = tuple(field for field in EVENT_FILTERS if request.args.get(field))
+    params = [request.args.get(field) if field == 'location_id' else int(request.args.get(field))
+              for field in filters]
+    
+    # Get paginated results with the filtered total alongside, seeking past
+    # the cursor instead of skipping rows
+    page_params = list(params)
+    after = None
+    if request.args.get('after'):
+        after = decode_cursor(request.args.get('after'), 4)
+        if after is None:
+            return json_response({'error': 'Invalid cursor'}), 400
+        page_params.extend(after)
+        offset = 0
+    
+    page_sql, count_sql = compose_events_sql(filters, after is not None)
+    cursor = db.query_iter(page_sql, tuple(params + page_params + [limit, offset]))
+    
+    # Rows go out as they are read; count, total and cursor are tracked on
+    # the way and written after the array
+    page = {'count': 0, 'total': None, 'last': None}
+    
+    def page_rows() -> Iterator[Dict]:
+        for row in (cursor or ()):
+            row = dict(row)
+            page['total'] = row.pop('_total')
+            page['last'] = (row['season'], row['episode'], row['timestamp'] or '', row.pop('id'))
+            page['count'] += 1
+            yield row
+    
+    def body() -> Iterator[bytes]:
+        yield b'{"events":'
+        yield from json_array_chunks(page_rows())
+        total = page['total']
+        if total is None:
+            # Past the last page there is no row to carry the total
+            count_result = db.query_one(count_sql, tuple(params))
+            total = count_result['total'] if count_result else 0
+        yield b',' + orjson.dumps({
+            'total': total,
+            'count': page['count'],
+            'offset': offset,
+            'next_cursor': encode_cursor(page['last']) if page['count'] == limit else None
+        })[1:]
+    
+    return stream_json_response(body())
+
+@lru_cache(maxsize=64)
+def compose_events_sql(filters: Tuple[str, ...], keyset: bool) -> Tuple[str, str]:
+    """Build the events page and count SQL once per filter combination.
+    
+    Reusing identical SQL text keeps each connection's prepared-statement
+    cache warm; only the bound parameters change between requests. The page
+    is ordered by the same IFNULL'd key the cursor compares, so NULL and ''
+    timestamps can't be skipped or repeated across pages.
+    """
+    where_clause = "WHERE 1=1" + "".join(f" AND {field} = ?" for field in filters)
+    page_clause = where_clause
+    if keyset:
+        page_clause += " AND (season, episode, IFNULL(timestamp, ''), id) > (?, ?, ?, ?)"
+    page_sql = f"""
+        SELECT id, season, episode, timestamp, event_type, text, confidence,
+               (SELECT COUNT(*) FROM events {where_clause}) as _total
         FROM events
-        {where_clause}
-        ORDER BY season, episode, timestamp
+        {page_clause}
+        ORDER BY season, episode, IFNULL(timestamp, ''), id
         LIMIT ? OFFSET ?
-    """, tuple(params_with_limit))
-    
-    return jsonify({
-        'total': total,
+    """
+    return page_sql, f"SELECT COUNT(*) as total FROM events {where_clause}"
+
+def get_events_from_json(limit: int, offset: int):
+    """Serve /api/v2/events from events.json via its precomputed filter index."""
+    index = load_event_index()
+    if index is None:
+        return json_response({'events': [], 'count': 0, 'total': 0})
+    
+    # Intersect the row positions of each requested filter value
+    matches = None
+    for field in EVENT_FILTERS:
+        value = request.args.get(field)
+        if value:
+            if field != 'location_id':
+                value = str(int(value))
+            rows = index['positions'][field].get(value, ())
+            matches = set(rows) if matches is None else matches.intersection(rows)
+    positions = range(len(index['events'])) if matches is None else sorted(matches)
+    
+    if request.args.get('after'):
+        after = decode_cursor(request.args.get('after'), 1)
+        if after is None:
+            return json_response({'error': 'Invalid cursor'}), 400
+        offset = after[0]
+    
+    page = positions[offset:offset + limit]
+    events = [index['events'][i] for i in page]
+    next_cursor = encode_cursor((offset + limit,)) if offset + limit < len(positions) else None
+    
+    return json_response({
+        'total': len(positions),
         'count': len(events),
         'offset': offset,
-        'events': events
+        'events': events,
+        'next_cursor': next_cursor
     })
 
 # ============================================================================
@@ -412,7 +875,7 @@ def get_artifacts():
     """
     if not db.available:
         data = load_json_slice("artifacts_summary")
-        return jsonify(data or [])
+        return json_response(data or [])
     
     where_clause = "WHERE 1=1"
     params = []
@@ -429,19 +892,20 @@ def get_artifacts():
         where_clause += " AND type = ?"
         params.append(request.args.get('type'))
     
-    artifacts = db.query_all(f"""
+    cursor = db.query_iter(f"""
         SELECT id, name, artifact_type as type, location_id, season, episode, confidence FROM artifacts
         {where_clause}
         ORDER BY season, episode
     """, tuple(params))
     
-    return jsonify(artifacts)
+    return stream_json_response(json_array_chunks(cursor or ()))
 
 # ============================================================================
 # API ENDPOINTS: THEORIES
 # ============================================================================
 
 @app.route('/api/v2/theories', methods=['GET'])
+@cached_response()
 def get_theories():
     """Get all theories with mention counts and evidence.
     
@@ -456,16 +920,21 @@ def get_theories():
     """
     if not db.available:
         data = load_json_slice("theories_summary")
-        return jsonify(data or [])
-    
-    theories = db.query_all("""
-        SELECT id, name, theory_type as type, evidence_count,
-               (SELECT COUNT(*) FROM theory_mentions WHERE theory_id = theories.id) as mentions
-        FROM theories
-        ORDER BY evidence_count DESC
+        return json_response(data or [])
+    
+    theories = db.query_rows("""
+        SELECT t.id, t.name, t.theory_type as type, t.evidence_count,
+               COALESCE(m.mentions, 0) as mentions
+        FROM theories t
+        LEFT JOIN (
+            SELECT theory_id, COUNT(*) as mentions
+            FROM theory_mentions
+            GROUP BY theory_id
+        ) m ON m.theory_id = t.id
+        ORDER BY t.evidence_count DESC
     """)
     
-    return jsonify(theories)
+    return json_response(theories)
 
 @app.route('/api/v2/theories/<theory_id>/mentions', methods=['GET'])
 def get_theory_mentions(theory_id: str):
@@ -474,47 +943,101 @@ def get_theory_mentions(theory_id: str):
     Query Parameters:
         season: Filter by season
         limit: Results per page
-        offset: Pagination offset
+        after: Cursor from a previous page's next_cursor
+        offset: Pagination offset (deprecated, ignored when after is given)
     
     Returns:
         {
             "theory_id": "treasure",
             "total_mentions": 1605,
-            "mentions": [...]
+            "mentions": [...],
+            "next_cursor": "..."
         }
     """
     if not db.available:
-        return jsonify({'mentions': [], 'total': 0})
-    
-    limit = min(int(request.args.get('limit', 100)), 1000)
-    offset = int(request.args.get('offset', 0))
-    
-    # Count
-    count_result = db.query_one("""
-        SELECT COUNT(*) as total FROM theory_mentions WHERE theory_id = ?
-    """, (theory_id,))
-    total = count_result['total'] if count_result else 0
-    
-    # Get mentions
-    mentions = db.query_all("""
-        SELECT season, episode, timestamp, text, confidence
+        return json_response({'mentions': [], 'total': 0})
+    
+    limit = int_arg('limit', 100, 1, MAX_PAGE_SIZE)
+    offset = int_arg('offset', 0, 0, MAX_OFFSET)
+    
+    # Get mentions with the theory's total alongside, seeking past the
+    # cursor instead of skipping rows
+    page_clause = "WHERE theory_id = ?"
+    page_params = [theory_id]
+    if request.args.get('after'):
+        after = decode_cursor(request.args.get('after'), 3)
+        if after is None:
+            return json_response({'error': 'Invalid cursor'}), 400
+        page_clause += " AND (season, episode, id) > (?, ?, ?)"
+        page_params.extend(after)
+        offset = 0
+    
+    rows = db.query_all(f"""
+        SELECT id, season, episode, timestamp, text, confidence,
+               (SELECT COUNT(*) FROM theory_mentions WHERE theory_id = ?) as _total
         FROM theory_mentions
-        WHERE theory_id = ?
-        ORDER BY season, episode
+        {page_clause}
+        ORDER BY season, episode, id
         LIMIT ? OFFSET ?
-    """, (theory_id, limit, offset))
+    """, tuple([theory_id] + page_params + [limit, offset]))
     
-    return jsonify({
+    if rows:
+        total = rows[0]['_total']
+    else:
+        # Past the last page there is no row to carry the total
+        count_result = db.query_one("""
+            SELECT COUNT(*) as total FROM theory_mentions WHERE theory_id = ?
+        """, (theory_id,))
+        total = count_result['total'] if count_result else 0
+    
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor((last['season'], last['episode'], last['id']))
+    # Drop the cursor/total helper columns in place rather than copying rows
+    for row in rows:
+        del row['id'], row['_total']
+    mentions = rows
+    
+    return json_response({
         'theory_id': theory_id,
         'total_mentions': total,
-        'mentions': mentions
+        'mentions': mentions,
+        'next_cursor': next_cursor
     })
 
 # ============================================================================
 # API ENDPOINTS: PEOPLE
 # ============================================================================
 
+# mention_count is recomputed from person_mentions by the pipeline's
+# normalization phase (update_statistics), so no aggregate is needed here
+PEOPLE_SQL = """
+    SELECT id, name, role, COALESCE(mention_count, 0) as mentions,
+           first_appearance_season as first_season, last_appearance_season as last_season
+    FROM people
+    ORDER BY name
+"""
+
+PERSON_SQL = """
+    SELECT id, name, role, 
+           first_appearance_season as first_season, 
+           last_appearance_season as last_season,
+           (SELECT COUNT(*) FROM person_mentions WHERE person_id = people.id) as mentions_total
+    FROM people
+    WHERE id = ?
+"""
+
+PERSON_MENTIONS_SQL = """
+    SELECT season, episode, timestamp, text, confidence
+    FROM person_mentions
+    WHERE person_id = ?
+    ORDER BY season, episode
+    LIMIT ?
+"""
+
 @app.route('/api/v2/people', methods=['GET'])
+@cached_response()
 def get_people():
     """Get all people (hosts, experts, team members).
     
@@ -530,17 +1053,11 @@ def get_people():
     """
     if not db.available:
         data = load_json_slice("people_summary")
-        return jsonify(data or [])
+        return negotiated_response(data or [])
     
-    people = db.query_all("""
-        SELECT id, name, role,
-               (SELECT COUNT(*) FROM person_mentions WHERE person_id = people.id) as mentions,
-               first_appearance_season as first_season, last_appearance_season as last_season
-        FROM people
-        ORDER BY name
-    """)
+    people = db.query_rows(PEOPLE_SQL)
     
-    return jsonify(people)
+    return negotiated_response(people)
 
 @app.route('/api/v2/people/<person_id>', methods=['GET'])
 def get_person_detail(person_id: str):
@@ -565,40 +1082,75 @@ def get_person_detail(person_id: str):
         data = load_json_slice("people_summary")
         for person in (data or []):
             if person.get('id') == person_id:
-                return jsonify(person)
-        return jsonify({'error': 'Person not found'}), 404
+                return negotiated_response(person)
+        return json_response({'error': 'Person not found'}), 404
     
-    person = db.query_one("""
-        SELECT id, name, role, 
-               first_appearance_season as first_season, 
-               last_appearance_season as last_season
-        FROM people
-        WHERE id = ?
-    """, (person_id,))
+    person = db.query_one(PERSON_SQL, (person_id,))
     
     if not person:
-        return jsonify({'error': 'Person not found'}), 404
+        return json_response({'error': 'Person not found'}), 404
     
-    limit = int(request.args.get('limit', 100))
+    limit = int_arg('limit', 100, 1, MAX_PAGE_SIZE)
     
-    # Get mentions
-    mentions = db.query_all("""
-        SELECT season, episode, timestamp, text, confidence
-        FROM person_mentions
-        WHERE person_id = ?
-        ORDER BY season, episode
-        LIMIT ?
-    """, (person_id, limit))
+    # Stream mentions straight from the cursor after the person's fields
+    cursor = db.query_iter(PERSON_MENTIONS_SQL, (person_id, limit))
+    
+    if wants_msgpack():
+        person['mentions'] = list(cursor or ())
+        return negotiated_response(person)
     
-    person['mentions_total'] = len(mentions)
-    person['mentions'] = mentions
+    def body() -> Iterator[bytes]:
+        yield orjson.dumps(person)[:-1] + b',"mentions":'
+        yield from json_array_chunks(cursor or ())
+        yield b'}'
     
-    return jsonify(person)
+    response = stream_json_response(body())
+    response.vary.add('Accept')
+    return response
 
 # ============================================================================
 # API ENDPOINTS: SEARCH
 # ============================================================================
 
+SEARCH_SQL = {
+    'locations': """
+        SELECT id, name, type, latitude as lat, longitude as lng
+        FROM locations
+        WHERE {match}
+        LIMIT ?
+    """,
+    'theories': """
+        SELECT id, name, theory_type as type, evidence_count
+        FROM theories
+        WHERE {match}
+        LIMIT ?
+    """,
+    'people': """
+        SELECT id, name, role, 
+               first_appearance_season as first_season, 
+               last_appearance_season as last_season
+        FROM people
+        WHERE {match}
+        LIMIT ?
+    """,
+    'artifacts': """
+        SELECT id, name, artifact_type as type, location_id, season, episode
+        FROM artifacts
+        WHERE {match}
+        LIMIT ?
+    """
+}
+
+@lru_cache(maxsize=2)
+def search_queries(name_search: bool) -> Dict[str, str]:
+    """Per-table search SQL, matching names through the trigram index when the database has one."""
+    return {
+        table: sql.format(match=(
+            f"rowid IN (SELECT rowid FROM {table}_fts WHERE name LIKE ?)" if name_search else "name LIKE ?"
+        ))
+        for table, sql in SEARCH_SQL.items()
+    }
+
 @app.route('/api/v2/search', methods=['GET'])
 def search():
     """Full-text search across locations, theories, people, and artifacts.
@@ -621,10 +1173,10 @@ def search():
     """
     query = request.args.get('q', '').strip()
     if not query or len(query) < 2:
-        return jsonify({'error': 'Query must be at least 2 characters'}), 400
+        return json_response({'error': 'Query must be at least 2 characters'}), 400
     
     search_term = f"%{query}%"
-    limit = int(request.args.get('limit', 50))
+    limit = int_arg('limit', 50, 1, MAX_PAGE_SIZE)
     
     results = {
         'query': query,
@@ -637,49 +1189,107 @@ def search():
     }
     
     if not db.available:
-        return jsonify(results)
+        return json_response(results)
     
-    # Search locations
-    results['results']['locations'] = db.query_all("""
-        SELECT id, name, type, latitude as lat, longitude as lng
-        FROM locations
-        WHERE name LIKE ?
-        LIMIT ?
-    """, (search_term, limit))
+    queries = search_queries(db.name_search)
     
-    # Search theories
-    results['results']['theories'] = db.query_all("""
-        SELECT id, name, theory_type as type, evidence_count
-        FROM theories
-        WHERE name LIKE ?
-        LIMIT ?
-    """, (search_term, limit))
+    # The tables are independent, and sqlite releases the GIL while it
+    # works, so run the four lookups concurrently.
+    futures = {
+        key: SEARCH_POOL.submit(db.query_rows, sql, (search_term, limit))
+        for key, sql in queries.items()
+    }
+    for key, future in futures.items():
+        results['results'][key] = future.result()
     
-    # Search people
-    results['results']['people'] = db.query_all("""
-        SELECT id, name, role, 
-               first_appearance_season as first_season, 
-               last_appearance_season as last_season
-        FROM people
-        WHERE name LIKE ?
-        LIMIT ?
-    """, (search_term, limit))
+    return json_response(results)
+
+# ============================================================================
+# API ENDPOINTS: CHAT
+# ============================================================================
+
+@app.route('/chat', methods=['POST'])
+def chat():
+    """Answer a natural-language question via the oak_chat engine.
     
-    # Search artifacts
-    results['results']['artifacts'] = db.query_all("""
-        SELECT id, name, artifact_type as type, location_id, season, episode
-        FROM artifacts
-        WHERE name LIKE ?
-        LIMIT ?
-    """, (search_term, limit))
+    Body:
+        {"query": "Who found the lead cross?"}
+    
+    Returns:
+        {"answer": "...", "route": "..."}
+    """
+    logger.info(f"Received /chat request from {request.remote_addr}")
+    try:
+        data = request.get_json(force=True) or {}
+    except Exception as e:
+        logger.warning(f"Invalid JSON in /chat request: {e}")
+        return json_response({'error': 'Invalid JSON'}), 400
+    
+    user_query = data.get('query', '').strip()
+    if not user_query:
+        logger.info("/chat request missing 'query' field")
+        return json_response({'error': "Missing 'query'"}), 400
+    
+    try:
+        # Imported lazily so the REST API runs without the chat dependencies
+        from oak_chat.engine import answer_query
+        result = answer_query(user_query)
+    except Exception as e:
+        logger.exception(f"Error in answer_query for /chat: {e}")
+        return json_response({'error': 'Internal server error'}), 500
     
-    return jsonify(results)
+    return json_response({
+        'answer': result.get('answer'),
+        'route': result.get('route')
+    })
 
 # ============================================================================
 # API ENDPOINTS: STATUS & HEALTH
 # ============================================================================
 
+STATUS_TABLES = ('locations', 'episodes', 'people', 'theories', 'events', 'artifacts', 'measurements')
+_status_counts: Tuple[float, Optional[Dict[str, int]]] = (0.0, None)
+
+def _compute_counts() -> Optional[Dict[str, int]]:
+    """Row counts per table, read from sqlite_stat1 where ANALYZE has run.
+    
+    The leading number of a stat1 entry is the table's row count as of the
+    last ANALYZE (run by etl_normalize_semantic.py); tables it does not
+    cover are counted exactly.
+    """
+    counts = {}
+    if db.query_one("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"):
+        placeholders = ','.join('?' * len(STATUS_TABLES))
+        for row in db.query_all(f"""
+            SELECT tbl, MAX(CAST(stat AS INTEGER)) as n
+            FROM sqlite_stat1
+            WHERE tbl IN ({placeholders})
+            GROUP BY tbl
+        """, STATUS_TABLES):
+            counts[row['tbl']] = row['n']
+    
+    missing = [t for t in STATUS_TABLES if t not in counts]
+    if missing:
+        exact = db.query_one("SELECT " + ", ".join(
+            f"(SELECT COUNT(*) FROM {t}) as {t}" for t in missing
+        ))
+        if exact is None:
+            return None
+        counts.update(exact)
+    return {t: counts[t] for t in STATUS_TABLES}
+
+def status_counts() -> Optional[Dict[str, int]]:
+    """Return table counts, recomputing at most every STATUS_COUNTS_TIMEOUT seconds."""
+    global _status_counts
+    expires, counts = _status_counts
+    now = time.monotonic()
+    if counts is None or expires <= now:
+        counts = _compute_counts()
+        _status_counts = (now + STATUS_COUNTS_TIMEOUT, counts)
+    return counts
+
 @app.route('/api/status', methods=['GET'])
+@cached_response(STATUS_CACHE_TIMEOUT)
 def get_status():
     """Get API and database status.
     
@@ -705,20 +1315,40 @@ def get_status():
     
     if db.available:
         # Get database statistics
-        stats = db.query_one("""
-            SELECT 
-                (SELECT COUNT(*) FROM locations) as locations,
-                (SELECT COUNT(*) FROM episodes) as episodes,
-                (SELECT COUNT(*) FROM people) as people,
-                (SELECT COUNT(*) FROM theories) as theories,
-                (SELECT COUNT(*) FROM events) as events,
-                (SELECT COUNT(*) FROM artifacts) as artifacts,
-                (SELECT COUNT(*) FROM measurements) as measurements
-        """)
+        stats = status_counts()
         if stats:
-            status_data['counts'] = dict(stats)
+            status_data['counts'] = stats
+    
+    return json_response(status_data)
+
+@app.route('/api/v2/_cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    """Drop cached catalog responses and JSON slices after a database update.
     
-    return jsonify(status_data)
+    Requires the CACHE_INVALIDATE_TOKEN secret in an X-Cache-Token header;
+    behind the front proxy every request comes from loopback, so the peer
+    address proves nothing. Disabled while the secret is unset.
+    """
+    if not CACHE_INVALIDATE_TOKEN:
+        return json_response({'error': 'Not found'}), 404
+    token = request.headers.get('X-Cache-Token', '')
+    if not hmac.compare_digest(token.encode(), CACHE_INVALIDATE_TOKEN.encode()):
+        return json_response({'error': 'Forbidden'}), 403
+    
+    with _response_cache_lock:
+        responses = len(_response_cache)
+        _response_cache.clear()
+    with db._cache_lock:
+        slices = len(db.json_cache)
+        db.json_cache.clear()
+    global _status_counts
+    _status_counts = (0.0, None)
+    # Chat routes cache DB rows too, but only once /chat has loaded the engine
+    router = sys.modules.get('oak_chat.router')
+    routes = router.clear_route_cache() if router else 0
+    
+    logger.info(f"Cache invalidated: {responses} responses, {slices} JSON slices, {routes} chat routes")
+    return json_response({'status': 'ok', 'responses': responses, 'slices': slices, 'routes': routes})
 
 # ============================================================================
 # STATIC FILE SERVING
@@ -728,23 +1358,22 @@ def get_status():
 @app.route('/<path:path>')
 def serve_static(path):
     """Serve static files from docs/ directory (SPA fallback)."""
-    file_path = APP_DIR / path
+    file_path = os.path.normpath(os.path.join(APP_DIR_PREFIX, path))
     
     # Security: prevent directory traversal
-    try:
-        if not str(file_path.resolve()).startswith(str(APP_DIR.resolve())):
-            return jsonify({'error': 'Access denied'}), 403
-    except:
-        return jsonify({'error': 'Invalid path'}), 400
+    if not file_path.startswith(APP_DIR_PREFIX):
+        return json_response({'error': 'Access denied'}), 403
     
-    if file_path.is_file():
-        return send_from_directory(str(APP_DIR), path)
+    # Already confined to APP_DIR above, so send it directly rather than
+    # letting send_from_directory re-join and re-check the path
+    if os.path.isfile(file_path):
+        return send_file(file_path)
     
     # Fallback to index.html for SPA routing
-    if (APP_DIR / 'index.html').exists():
-        return send_from_directory(str(APP_DIR), 'index.html')
+    if os.path.isfile(INDEX_HTML):
+        return send_file(INDEX_HTML)
     
-    return jsonify({'error': 'Not found'}), 404
+    return json_response({'error': 'Not found'}), 404
 
 
 
@@ -767,7 +1396,7 @@ def not_found(error):
         'remote_addr': request.remote_addr,
         'error': str(error)
     })
-    return jsonify({
+    return json_response({
         'error': 'Not found',
         'status': 404,
         'path': request.path
@@ -783,7 +1412,7 @@ def internal_error(error):
         'remote_addr': request.remote_addr,
         'error': str(error)
     })
-    return jsonify({
+    return json_response({
         'error': 'Internal server error',
         'status': 500,
         'path': request.path
@@ -805,7 +1434,6 @@ if __name__ == '__main__':
     args = parser.parse_args()
     
     if args.db:
-        import os
         os.environ['DATABASE_PATH'] = args.db
     
     logger.info("=" * 80)
@@ -819,52 +1447,25 @@ if __name__ == '__main__':
     logger.info(f"  Debug mode: {args.dev}")
     logger.info("=" * 80)
     
-    app.run(
-        host=args.host,
-        port=args.port,
-        debug=args.dev,
-        use_reloader=args.dev
-    )
-# api_server_v2.py
-
-
-from flask import Flask, request, jsonify
-from oak_chat.engine import answer_query
-import logging
-
-app = Flask(__name__)
-
-# Use the root logger for consistency with the rest of the file
-logger = logging.getLogger(__name__)
-
-@app.post("/chat")
-def chat():
-    try:
-        logger.info("Received /chat request from %s", request.remote_addr)
-        try:
-            data = request.get_json(force=True) or {}
-        except Exception as e:
-            logger.warning("Invalid JSON in /chat request: %s", e)
-            return jsonify({"error": "Invalid JSON"}), 400
-
-        user_query = data.get("query", "").strip()
-        if not user_query:
-            logger.info("/chat request missing 'query' field")
-            return jsonify({"error": "Missing 'query'"}), 400
-
+    if args.dev:
+        app.run(
+            host=args.host,
+            port=args.port,
+            debug=True,
+            use_reloader=True
+        )
+    else:
         try:
-            result = answer_query(user_query)
-        except Exception as exc:
-            logger.exception("Error in answer_query for /chat: %s", exc)
-            return jsonify({"error": "Internal server error"}), 500
-
-        return jsonify({
-            "answer": result.get("answer"),
-            "route": result.get("route"),
-        })
-    except Exception as exc:
-        logger.exception("Unexpected error in /chat endpoint: %s", exc)
-        return jsonify({"error": "Internal server error"}), 500
-
-if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000, debug=True)
+            from waitress import serve
+        except ImportError:
+            logger.warning("waitress not installed; using Flask's threaded server (or run gunicorn with wsgi:app)")
+            app.run(host=args.host, port=args.port, threaded=True)
+        else:
+            serve(
+                app,
+                host=args.host,
+                port=args.port,
+                threads=SERVER_THREADS,
+                connection_limit=1000,
+                channel_timeout=30
+            )
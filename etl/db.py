@@ -1,39 +1,185 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, event, make_url
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import Engine
+import re
 import sqlite3
+from functools import lru_cache
 from .config import DB_URL, SCHEMA_PATH
 from .logging_utils import log_info
 
 _engine = None
+_read_engine = None
 _Session = None
 
+# Every SQLite connection
+SQLITE_PRAGMAS = (
+    'PRAGMA foreign_keys=ON',
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA temp_store=MEMORY',
+)
+
+# Bulk-ingest settings for get_engine's writer connections only
+SQLITE_WRITE_PRAGMAS = SQLITE_PRAGMAS + (
+    'PRAGMA cache_size=-262144',  # 256 MB, keeps ON CONFLICT index probes in memory
+    'PRAGMA busy_timeout=600000',  # parallel ingesters queue for the write lock
+)
+
+# Chat readers: get_read_engine pools READ_POOL_SIZE of these, so keep each small
+SQLITE_READ_PRAGMAS = SQLITE_PRAGMAS + (
+    'PRAGMA query_only=ON',
+    'PRAGMA cache_size=-8192',  # 8 MB
+    'PRAGMA busy_timeout=5000',
+)
+
+# psycopg2 only: send executemany INSERTs through execute_values and the
+# remaining UPDATE/DELETE batches through execute_batch
+PSYCOPG2_ENGINE_OPTIONS = {
+    'executemany_mode': 'values_plus_batch',
+    'insertmanyvalues_page_size': 1000,
+    'executemany_batch_page_size': 500,
+}
+
+def _apply_sqlite_pragmas(dbapi_conn, pragmas):
+    cursor = dbapi_conn.cursor()
+    for pragma in pragmas:
+        cursor.execute(pragma)
+    cursor.close()
+    # Let SQLAlchemy drive transactions instead of pysqlite's implicit BEGIN
+    dbapi_conn.isolation_level = None
+
+def _set_sqlite_write_pragmas(dbapi_conn, connection_record):
+    _apply_sqlite_pragmas(dbapi_conn, SQLITE_WRITE_PRAGMAS)
+
+def _set_sqlite_read_pragmas(dbapi_conn, connection_record):
+    _apply_sqlite_pragmas(dbapi_conn, SQLITE_READ_PRAGMAS)
+
+def _begin_immediate(conn):
+    # Take the write lock up front so each ingester runs as one transaction
+    conn.exec_driver_sql('BEGIN IMMEDIATE')
+
 def get_engine() -> Engine:
     global _engine
     if _engine is None:
-        _engine = create_engine(DB_URL, echo=False, future=True)
+        options = {}
+        if make_url(DB_URL).get_driver_name() == 'psycopg2':
+            options.update(PSYCOPG2_ENGINE_OPTIONS)
+        _engine = create_engine(DB_URL, echo=False, future=True, **options)
         if DB_URL.startswith('sqlite'):
-            # Enable foreign keys for SQLite
-            with _engine.connect() as conn:
-                conn.execute(text('PRAGMA foreign_keys=ON'))
+            # Apply on every pooled connection, not just the first one
+            event.listen(_engine, 'connect', _set_sqlite_write_pragmas)
+            event.listen(_engine, 'begin', _begin_immediate)
     return _engine
 
+# Read-side pool: enough connections for concurrent chat lookups
+READ_POOL_SIZE = 10
+
+def get_read_engine() -> Engine:
+    """Pooled engine for read-only callers such as the chat queries.
+    
+    Same database as get_engine, but without BEGIN IMMEDIATE, so readers
+    never queue for the SQLite write lock. Connections are query_only with
+    a small page cache and a short busy timeout (SQLITE_READ_PRAGMAS).
+    """
+    global _read_engine
+    if _read_engine is None:
+        if DB_URL.startswith('sqlite'):
+            _read_engine = create_engine(DB_URL, echo=False, future=True, pool_size=READ_POOL_SIZE)
+            event.listen(_read_engine, 'connect', _set_sqlite_read_pragmas)
+        else:
+            # Server connections can be dropped while idle in the pool
+            _read_engine = create_engine(DB_URL, echo=False, future=True, pool_size=READ_POOL_SIZE, pool_pre_ping=True)
+    return _read_engine
+
 def get_session() -> Session:
     global _Session
     if _Session is None:
         _Session = sessionmaker(bind=get_engine(), autoflush=False, autocommit=False, future=True)
     return _Session()
 
+def load_keys(conn, sql: str, params: dict = None) -> dict:
+    """Map each row's natural key (columns after the first) to its id (first column).
+    
+    Keys containing NULL are left out: they never match in SQL either.
+    """
+    keys = {}
+    for row in conn.execute(text(sql), params or {}):
+        key = tuple(row[1:])
+        if None not in key:
+            keys[key] = row[0]
+    return keys
+
+# Quoted literals and identifiers, or a bare ? or %
+_QMARK_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|[?%]")
+
+def _format_token(match) -> str:
+    token = match.group()
+    if token == '?':
+        return '%s'
+    # The driver reads % everywhere, quoted or not, so every literal % is doubled
+    return token.replace('%', '%%')
+
+@lru_cache(maxsize=None)
+def _qmark_to_format(sql: str) -> str:
+    """Rewrite ? placeholders to %s, leaving ? inside quotes alone and escaping %."""
+    return _QMARK_TOKEN_RE.sub(_format_token, sql)
+
+def executemany(conn, sql: str, rows: list) -> int:
+    """Run sql once per positional row straight on the driver.
+    
+    Skips SQLAlchemy's per-row bind processing. sql uses ? placeholders,
+    rewritten to %s (with literal % escaped) for drivers with the format
+    paramstyles. Returns the
+    number of rows the statement changed (conflicts skipped by ON CONFLICT
+    DO NOTHING don't count).
+    """
+    if conn.dialect.paramstyle in ('format', 'pyformat'):
+        sql = _qmark_to_format(sql)
+    return conn.exec_driver_sql(sql, rows).rowcount
+
+# Tables with a trigram FTS5 index (<table>_fts) in schema.sql
+TEXT_SEARCH_TABLES = ('events', 'theories', 'transcripts')
+
+def text_search_in_sync(conn, table: str) -> bool:
+    """True if table's <table>_fts index exists and covers every row of table.
+    
+    The triggers keep a complete index complete. An index created over
+    existing rows starts empty and must be rebuilt before it is trusted.
+    """
+    try:
+        return bool(conn.execute(text(
+            f"SELECT (SELECT COUNT(*) FROM {table}_fts_docsize) = (SELECT COUNT(*) FROM {table})"
+        )).scalar())
+    except Exception:
+        return False
+
+def _schema_statements(sql: str):
+    """Split a schema script on ';', keeping trigger bodies (BEGIN ... END) whole."""
+    stmt = ''
+    for part in sql.split(';'):
+        stmt += part + ';'
+        if sqlite3.complete_statement(stmt):
+            stmt = stmt[:-1].strip()
+            if stmt:
+                yield stmt
+            stmt = ''
+
 def init_db(schema_path: str = SCHEMA_PATH):
     engine = get_engine()
     with engine.connect() as conn:
         with open(schema_path, 'r') as f:
             sql = f.read()
-        for stmt in sql.split(';'):
-            stmt = stmt.strip()
-            if stmt:
-                try:
-                    conn.execute(text(stmt))
-                except Exception as e:
-                    log_info(f"Skipping statement (may already exist): {stmt[:40]}...", error=str(e))
+        for stmt in _schema_statements(sql):
+            try:
+                conn.execute(text(stmt))
+            except Exception as e:
+                log_info(f"Skipping statement (may already exist): {stmt[:40]}...", error=str(e))
+        if conn.dialect.name == 'sqlite':
+            # Index rows loaded before the triggers existed, before anything else writes
+            for table in TEXT_SEARCH_TABLES:
+                if not text_search_in_sync(conn, table):
+                    conn.execute(text(f"INSERT INTO {table}_fts({table}_fts) VALUES('rebuild')"))
+                    log_info('text_search_rebuilt', table=table)
+        conn.commit()
     log_info("Database initialized.")
@@ -1,9 +1,10 @@
 
 
-from typing import Dict, Tuple, Optional
-from sqlalchemy import text
+from typing import Dict, Tuple, Optional, Iterable
+from sqlalchemy import text, event
 from sqlalchemy.engine import Connection
-from .logging_utils import log_info
+from .db import executemany, get_engine
+from .logging_utils import log_info, log_debug, DEBUG_ENABLED as _LOG_DEBUG
 
 # In-memory ID maps
 EPISODE_MAP: Dict[Tuple[int, int], int] = {}
@@ -12,148 +13,197 @@ ARTIFACT_MAP: Dict[str, int] = {}
 BOREHOLE_MAP: Dict[str, int] = {}
 PEOPLE_MAP: Dict[str, int] = {}
 
-def get_or_create_episode(season: int, episode: int, session) -> int:
+def clear_maps() -> None:
+    for id_map in (EPISODE_MAP, LOCATION_MAP, ARTIFACT_MAP, BOREHOLE_MAP, PEOPLE_MAP):
+        id_map.clear()
+
+# Ids go into the maps as soon as they are inserted, inside the caller's
+# transaction. A rollback takes those rows back out of the database, so
+# forget everything and let preloads and misses refill from committed rows.
+def _clear_maps_on_rollback(conn) -> None:
+    clear_maps()
+
+event.listen(get_engine(), 'rollback', _clear_maps_on_rollback)
+
+# Statements are built once at import; SQLAlchemy's compiled cache keys on them
+
+PRELOAD_EPISODES_SQL = text("SELECT id, season, episode FROM episodes")
+PRELOAD_LOCATIONS_SQL = text("SELECT id, location_id FROM locations WHERE location_id IS NOT NULL")
+PRELOAD_ARTIFACTS_SQL = text("SELECT id, artifact_id FROM artifacts WHERE artifact_id IS NOT NULL")
+PRELOAD_BOREHOLES_SQL = text("SELECT id, borehole_id FROM boreholes WHERE borehole_id IS NOT NULL")
+PRELOAD_PEOPLE_SQL = text("SELECT id, name FROM people")
+
+# Preload: fill a map from one SELECT so existing rows resolve as dict hits
+
+def preload_episodes(conn) -> None:
+    rows = conn.execute(PRELOAD_EPISODES_SQL)
+    EPISODE_MAP.update(((season, episode), eid) for eid, season, episode in rows)
+
+def preload_locations(conn) -> None:
+    rows = conn.execute(PRELOAD_LOCATIONS_SQL)
+    LOCATION_MAP.update((legacy_id, lid) for lid, legacy_id in rows)
+
+def preload_artifacts(conn) -> None:
+    rows = conn.execute(PRELOAD_ARTIFACTS_SQL)
+    ARTIFACT_MAP.update((legacy_id, aid) for aid, legacy_id in rows)
+
+def preload_boreholes(conn) -> None:
+    rows = conn.execute(PRELOAD_BOREHOLES_SQL)
+    BOREHOLE_MAP.update((legacy_id, bid) for bid, legacy_id in rows)
+
+def preload_people(conn) -> None:
+    rows = conn.execute(PRELOAD_PEOPLE_SQL)
+    PEOPLE_MAP.update((name, pid) for pid, name in rows)
+
+# Bulk create: insert every key a batch will need in one executemany,
+# then refresh the map with one SELECT
+
+def bulk_create_episodes(keys: Iterable[Tuple[int, int]], conn) -> None:
+    missing = {k for k in keys if None not in k and k not in EPISODE_MAP}
+    if not missing:
+        return
+    inserted = executemany(
+        conn,
+        "INSERT INTO episodes (season, episode, title) VALUES (?, ?, ?) ON CONFLICT(season, episode) DO NOTHING",
+        [(season, episode, f"Unknown S{season}E{episode}") for season, episode in missing]
+    )
+    preload_episodes(conn)
+    log_info("episode_bulk_insert", count=inserted)
+
+def bulk_create_locations(legacy_ids: Iterable[str], conn) -> None:
+    missing = {k for k in legacy_ids if k and k not in LOCATION_MAP}
+    if not missing:
+        return
+    inserted = executemany(
+        conn,
+        "INSERT INTO locations (location_id, name, type) VALUES (?, ?, ?) ON CONFLICT(location_id) DO NOTHING",
+        [(legacy_id, legacy_id, "unknown") for legacy_id in missing]
+    )
+    preload_locations(conn)
+    log_info("location_bulk_insert", count=inserted)
+
+def bulk_create_boreholes(legacy_ids: Iterable[str], conn) -> None:
+    missing = {k for k in legacy_ids if k and k not in BOREHOLE_MAP}
+    if not missing:
+        return
+    inserted = executemany(
+        conn,
+        "INSERT INTO boreholes (borehole_id, name) VALUES (?, ?) ON CONFLICT(borehole_id) DO NOTHING",
+        [(legacy_id, legacy_id) for legacy_id in missing]
+    )
+    preload_boreholes(conn)
+    log_info("borehole_bulk_insert", count=inserted)
+
+# Misses insert without committing; the caller's transaction covers them.
+# DO NOTHING makes RETURNING yield a row only when one was created; an
+# existing row (say a season passed as a string) is looked up instead.
+
+INSERT_EPISODE_SQL = text(
+    "INSERT INTO episodes (season, episode, title) VALUES (:season, :episode, :title) ON CONFLICT(season, episode) DO NOTHING RETURNING id"
+)
+INSERT_LOCATION_SQL = text(
+    "INSERT INTO locations (location_id, name, type) VALUES (:legacy_id, :name, :type) ON CONFLICT(location_id) DO NOTHING RETURNING id"
+)
+INSERT_ARTIFACT_SQL = text(
+    "INSERT INTO artifacts (artifact_id, name) VALUES (:legacy_id, :name) ON CONFLICT(artifact_id) DO NOTHING RETURNING id"
+)
+INSERT_BOREHOLE_SQL = text(
+    "INSERT INTO boreholes (borehole_id, name) VALUES (:legacy_id, :name) ON CONFLICT(borehole_id) DO NOTHING RETURNING id"
+)
+INSERT_PERSON_SQL = text(
+    "INSERT INTO people (name) VALUES (:name) ON CONFLICT(name) DO NOTHING RETURNING id"
+)
+
+SELECT_EPISODE_SQL = text("SELECT id FROM episodes WHERE season = :season AND episode = :episode")
+SELECT_LOCATION_SQL = text("SELECT id FROM locations WHERE location_id = :legacy_id")
+SELECT_ARTIFACT_SQL = text("SELECT id FROM artifacts WHERE artifact_id = :legacy_id")
+SELECT_BOREHOLE_SQL = text("SELECT id FROM boreholes WHERE borehole_id = :legacy_id")
+SELECT_PERSON_SQL = text("SELECT id FROM people WHERE name = :name")
+
+def _insert_or_select(conn, insert_sql, select_sql, params: dict) -> Tuple[int, bool]:
+    """Return (id, created) for the row params names, inserting it if missing."""
+    row = conn.execute(insert_sql, params).fetchone()
+    if row is not None:
+        return row[0], True
+    return conn.execute(select_sql, params).scalar_one(), False
+
+def get_or_create_episode(season: int, episode: int, conn) -> int:
     key = (season, episode)
     if key in EPISODE_MAP:
         eid = EPISODE_MAP[key]
-        log_info("episode_lookup", season=season, episode=episode, id=eid)
-        return eid
-    row = session.execute(
-        text("SELECT id FROM episodes WHERE season = :season AND episode = :episode"),
-        {"season": season, "episode": episode}
-    ).fetchone()
-    if row:
-        eid = row[0]
-        EPISODE_MAP[key] = eid
-        log_info("episode_lookup", season=season, episode=episode, id=eid)
+        if _LOG_DEBUG:
+            log_debug("episode_lookup", season=season, episode=episode, id=eid)
         return eid
     log_info("episode_lookup_miss", season=season, episode=episode)
-    session.execute(
-        text("INSERT INTO episodes (season, episode, title) VALUES (:season, :episode, :title) ON CONFLICT(season, episode) DO NOTHING"),
+    eid, created = _insert_or_select(
+        conn, INSERT_EPISODE_SQL, SELECT_EPISODE_SQL,
         {"season": season, "episode": episode, "title": f"Unknown S{season}E{episode}"}
     )
-    session.commit()
-    row = session.execute(
-        text("SELECT id FROM episodes WHERE season = :season AND episode = :episode"),
-        {"season": season, "episode": episode}
-    ).fetchone()
-    eid = row[0]
     EPISODE_MAP[key] = eid
-    log_info("episode_insert", season=season, episode=episode, id=eid)
+    if created:
+        log_info("episode_insert", season=season, episode=episode, id=eid)
     return eid
 
-def get_or_create_location(legacy_id: str, session) -> int:
+def get_or_create_location(legacy_id: str, conn) -> int:
     if legacy_id in LOCATION_MAP:
         lid = LOCATION_MAP[legacy_id]
-        log_info("location_lookup", legacy_id=legacy_id, id=lid)
-        return lid
-    row = session.execute(
-        text("SELECT id FROM locations WHERE location_id = :legacy_id"),
-        {"legacy_id": legacy_id}
-    ).fetchone()
-    if row:
-        lid = row[0]
-        LOCATION_MAP[legacy_id] = lid
-        log_info("location_lookup", legacy_id=legacy_id, id=lid)
+        if _LOG_DEBUG:
+            log_debug("location_lookup", legacy_id=legacy_id, id=lid)
         return lid
     log_info("location_lookup_miss", legacy_id=legacy_id)
-    session.execute(
-        text("INSERT INTO locations (location_id, name, type) VALUES (:legacy_id, :name, :type) ON CONFLICT(location_id) DO NOTHING"),
+    lid, created = _insert_or_select(
+        conn, INSERT_LOCATION_SQL, SELECT_LOCATION_SQL,
         {"legacy_id": legacy_id, "name": legacy_id, "type": "unknown"}
     )
-    session.commit()
-    row = session.execute(
-        text("SELECT id FROM locations WHERE location_id = :legacy_id"),
-        {"legacy_id": legacy_id}
-    ).fetchone()
-    lid = row[0]
     LOCATION_MAP[legacy_id] = lid
-    log_info("location_insert", legacy_id=legacy_id, id=lid)
+    if created:
+        log_info("location_insert", legacy_id=legacy_id, id=lid)
     return lid
 
-def get_or_create_artifact(legacy_id: str, session) -> int:
+def get_or_create_artifact(legacy_id: str, conn) -> int:
     if legacy_id in ARTIFACT_MAP:
         aid = ARTIFACT_MAP[legacy_id]
-        log_info("artifact_lookup", legacy_id=legacy_id, id=aid)
-        return aid
-    row = session.execute(
-        text("SELECT id FROM artifacts WHERE artifact_id = :legacy_id"),
-        {"legacy_id": legacy_id}
-    ).fetchone()
-    if row:
-        aid = row[0]
-        ARTIFACT_MAP[legacy_id] = aid
-        log_info("artifact_lookup", legacy_id=legacy_id, id=aid)
+        if _LOG_DEBUG:
+            log_debug("artifact_lookup", legacy_id=legacy_id, id=aid)
         return aid
     log_info("artifact_lookup_miss", legacy_id=legacy_id)
-    session.execute(
-        text("INSERT INTO artifacts (artifact_id, name) VALUES (:legacy_id, :name) ON CONFLICT(artifact_id) DO NOTHING"),
+    aid, created = _insert_or_select(
+        conn, INSERT_ARTIFACT_SQL, SELECT_ARTIFACT_SQL,
         {"legacy_id": legacy_id, "name": legacy_id}
     )
-    session.commit()
-    row = session.execute(
-        text("SELECT id FROM artifacts WHERE artifact_id = :legacy_id"),
-        {"legacy_id": legacy_id}
-    ).fetchone()
-    aid = row[0]
     ARTIFACT_MAP[legacy_id] = aid
-    log_info("artifact_insert", legacy_id=legacy_id, id=aid)
+    if created:
+        log_info("artifact_insert", legacy_id=legacy_id, id=aid)
     return aid
 
-def get_or_create_borehole(legacy_id: str, session) -> int:
+def get_or_create_borehole(legacy_id: str, conn) -> int:
     if legacy_id in BOREHOLE_MAP:
         bid = BOREHOLE_MAP[legacy_id]
-        log_info("borehole_lookup", legacy_id=legacy_id, id=bid)
-        return bid
-    row = session.execute(
-        text("SELECT id FROM boreholes WHERE borehole_id = :legacy_id"),
-        {"legacy_id": legacy_id}
-    ).fetchone()
-    if row:
-        bid = row[0]
-        BOREHOLE_MAP[legacy_id] = bid
-        log_info("borehole_lookup", legacy_id=legacy_id, id=bid)
+        if _LOG_DEBUG:
+            log_debug("borehole_lookup", legacy_id=legacy_id, id=bid)
         return bid
     log_info("borehole_lookup_miss", legacy_id=legacy_id)
-    session.execute(
-        text("INSERT INTO boreholes (borehole_id, name) VALUES (:legacy_id, :name) ON CONFLICT(borehole_id) DO NOTHING"),
+    bid, created = _insert_or_select(
+        conn, INSERT_BOREHOLE_SQL, SELECT_BOREHOLE_SQL,
         {"legacy_id": legacy_id, "name": legacy_id}
     )
-    session.commit()
-    row = session.execute(
-        text("SELECT id FROM boreholes WHERE borehole_id = :legacy_id"),
-        {"legacy_id": legacy_id}
-    ).fetchone()
-    bid = row[0]
     BOREHOLE_MAP[legacy_id] = bid
-    log_info("borehole_insert", legacy_id=legacy_id, id=bid)
+    if created:
+        log_info("borehole_insert", legacy_id=legacy_id, id=bid)
     return bid
 
-def get_or_create_person(name: str, session) -> int:
+def get_or_create_person(name: str, conn) -> int:
     if name in PEOPLE_MAP:
         pid = PEOPLE_MAP[name]
-        log_info("person_lookup", name=name, id=pid)
-        return pid
-    row = session.execute(
-        text("SELECT id FROM people WHERE name = :name"),
-        {"name": name}
-    ).fetchone()
-    if row:
-        pid = row[0]
-        PEOPLE_MAP[name] = pid
-        log_info("person_lookup", name=name, id=pid)
+        if _LOG_DEBUG:
+            log_debug("person_lookup", name=name, id=pid)
         return pid
     log_info("person_lookup_miss", name=name)
-    session.execute(
-        text("INSERT INTO people (name) VALUES (:name) ON CONFLICT(name) DO NOTHING"),
+    pid, created = _insert_or_select(
+        conn, INSERT_PERSON_SQL, SELECT_PERSON_SQL,
         {"name": name}
     )
-    session.commit()
-    row = session.execute(
-        text("SELECT id FROM people WHERE name = :name"),
-        {"name": name}
-    ).fetchone()
-    pid = row[0]
     PEOPLE_MAP[name] = pid
-    log_info("person_insert", name=name, id=pid)
+    if created:
+        log_info("person_insert", name=name, id=pid)
     return pid
@@ -1,43 +1,34 @@
-import json
-from sqlalchemy import text
+import orjson
 from .config import EVENTS_PATH
-from .db import get_session
+from .db import get_engine, executemany
 from .logging_utils import log_info
-from .id_maps import EPISODE_MAP
+from .id_maps import EPISODE_MAP, preload_episodes, bulk_create_episodes, get_or_create_episode
+
+# One upsert per row on the idx_events_key unique index; a repeated key
+# (stored or earlier in the input) takes the later confidence/source_refs
+UPSERT_EVENTS_SQL = (
+    "INSERT INTO events (episode_id, timestamp, event_type, text, confidence, source_refs) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(episode_id, timestamp, event_type, text) DO UPDATE SET confidence=excluded.confidence, source_refs=excluded.source_refs"
+)
 
 
 def ingest_events():
-    session = get_session()
-    processed = inserted = updated = skipped = 0
-    with open(EVENTS_PATH) as f:
-        data = json.load(f)
-        for event in data:
-            season = event.get('season')
-            episode = event.get('episode')
-            timestamp = event.get('timestamp')
-            event_type = event.get('event_type')
-            text_ = event.get('text')
-            confidence = event.get('confidence')
-            source_refs = event.get('source_refs')
-            from .id_maps import get_or_create_episode
-            episode_id = get_or_create_episode(season, episode, session)
-            row = session.execute(
-                text("SELECT id FROM events WHERE episode_id = :episode_id AND timestamp = :timestamp AND event_type = :event_type AND text = :text_"),
-                {"episode_id": episode_id, "timestamp": timestamp, "event_type": event_type, "text_": text_}
-            ).fetchone()
-            if row:
-                session.execute(
-                    text("UPDATE events SET confidence=:confidence, source_refs=:source_refs WHERE id=:id"),
-                    {"confidence": confidence, "source_refs": source_refs, "id": row[0]}
-                )
-                updated += 1
-            else:
-                session.execute(
-                    text("INSERT INTO events (episode_id, timestamp, event_type, text, confidence, source_refs) VALUES (:episode_id, :timestamp, :event_type, :text_, :confidence, :source_refs)"),
-                    {"episode_id": episode_id, "timestamp": timestamp, "event_type": event_type, "text_": text_, "confidence": confidence, "source_refs": source_refs}
-                )
-                inserted += 1
-            processed += 1
-    session.commit()
+    with get_engine().begin() as conn:
+        preload_episodes(conn)
+        processed = inserted = updated = skipped = 0
+        rows = []
+        with open(EVENTS_PATH, 'rb') as f:
+            data = orjson.loads(f.read())
+            bulk_create_episodes(((e.get('season'), e.get('episode')) for e in data), conn)
+            for event in data:
+                season = event.get('season')
+                episode = event.get('episode')
+                episode_id = EPISODE_MAP.get((season, episode)) or get_or_create_episode(season, episode, conn)
+                rows.append((episode_id, event.get('timestamp'), event.get('event_type'), event.get('text'), event.get('confidence'), event.get('source_refs')))
+                processed += 1
+        if rows:
+            before = conn.exec_driver_sql("SELECT COUNT(*) FROM events").scalar()
+            executemany(conn, UPSERT_EVENTS_SQL, rows)
+            inserted = conn.exec_driver_sql("SELECT COUNT(*) FROM events").scalar() - before
+            updated = processed - inserted
     log_info('ingest_events', processed=processed, inserted=inserted, updated=updated, skipped=skipped)
-    session.close()
@@ -1,62 +1,37 @@
 from sqlalchemy import text
-from .db import get_session
+from .db import get_engine
 from .logging_utils import log_info
-from .id_maps import EPISODE_MAP, LOCATION_MAP, ARTIFACT_MAP, PEOPLE_MAP
+from .id_maps import preload_episodes, bulk_create_episodes
 
 
 def build_event_people_links():
-    session = get_session()
-    processed = inserted = skipped = 0
-    # Example: For each event, link to people by name (if available)
-    events = session.execute(text("SELECT id, episode_id, text FROM events")).fetchall()
-    for event in events:
-        event_id = event[0]
-        # Dummy: extract people names from text (placeholder, real logic should parse people mentions)
-        # For demo, skip if no people
-        continue  # TODO: Implement real extraction logic
-    log_info('build_event_people_links', processed=processed, inserted=inserted, skipped=skipped)
-    session.close()
+    # TODO: Implement real extraction logic (link events to people mentioned in their text).
+    # Until then skip the events scan entirely; when it lands, stream events with
+    # execution_options(yield_per=1000) and match names against the preloaded PEOPLE_MAP.
+    log_info('build_event_people_links', status='skipped')
 
 
 def build_event_location_links():
-    session = get_session()
-    processed = inserted = skipped = 0
-    # Example: For each event, link to locations by name/id (if available)
-    events = session.execute(text("SELECT id, episode_id, text FROM events")).fetchall()
-    for event in events:
-        event_id = event[0]
-        # Dummy: extract location names from text (placeholder, real logic should parse location mentions)
-        continue  # TODO: Implement real extraction logic
-    log_info('build_event_location_links', processed=processed, inserted=inserted, skipped=skipped)
-    session.close()
+    # TODO: Implement real extraction logic (link events to locations mentioned in their text).
+    # Skipped like build_event_people_links until then; stream events when it lands.
+    log_info('build_event_location_links', status='skipped')
 
 
 def build_artifact_episode_links():
-    session = get_session()
-    processed = inserted = skipped = 0
-    # For each artifact, link to episode by season/episode
-    artifacts = session.execute(text("SELECT id, season, episode FROM artifacts")).fetchall()
-    for artifact in artifacts:
-        artifact_id = artifact[0]
-        season = artifact[1]
-        episode = artifact[2]
-        if season is not None and episode is not None:
-            from .id_maps import get_or_create_episode
-            episode_id = get_or_create_episode(season, episode, session)
-            # Check if link exists
-            row = session.execute(
-                text("SELECT 1 FROM artifact_episodes WHERE artifact_id = :artifact_id AND episode_id = :episode_id"),
-                {"artifact_id": artifact_id, "episode_id": episode_id}
-            ).fetchone()
-            if not row:
-                session.execute(
-                    text("INSERT INTO artifact_episodes (artifact_id, episode_id) VALUES (:artifact_id, :episode_id)"),
-                    {"artifact_id": artifact_id, "episode_id": episode_id}
-                )
-                inserted += 1
-            else:
-                skipped += 1
-            processed += 1
-    session.commit()
+    with get_engine().begin() as conn:
+        preload_episodes(conn)
+        # Placeholder episodes first, so every dated artifact has one to join to
+        keys = conn.execute(text("SELECT DISTINCT season, episode FROM artifacts WHERE season IS NOT NULL AND episode IS NOT NULL")).all()
+        bulk_create_episodes((tuple(k) for k in keys), conn)
+        processed = conn.execute(text("SELECT COUNT(*) FROM artifacts WHERE season IS NOT NULL AND episode IS NOT NULL")).scalar()
+        # For each artifact, link to episode by season/episode in one statement;
+        # the primary key turns links that already exist into no-ops
+        result = conn.execute(text(
+            "INSERT INTO artifact_episodes (artifact_id, episode_id) "
+            "SELECT a.id, e.id FROM artifacts a JOIN episodes e ON e.season = a.season AND e.episode = a.episode "
+            "WHERE a.season IS NOT NULL AND a.episode IS NOT NULL "
+            "ON CONFLICT(artifact_id, episode_id) DO NOTHING"
+        ))
+        inserted = result.rowcount
+        skipped = processed - inserted
     log_info('build_artifact_episode_links', processed=processed, inserted=inserted, skipped=skipped)
-    session.close()
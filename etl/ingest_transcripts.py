@@ -1,18 +1,23 @@
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from sqlalchemy import text
 from .config import SRT_DIR
-from .db import get_session
+from .db import get_engine, load_keys
 from .logging_utils import log_info
+from .id_maps import EPISODE_MAP, preload_episodes, get_or_create_episode
 
-def parse_srt_file(filepath: str) -> str:
+SEASON_EPISODE_RE = re.compile(r'[sS](\d+)[eE](\d+)')
+
+def parse_srt_file(data: bytes) -> str:
     # Simple SRT parser: concatenate all text blocks
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    lines = data.decode('utf-8', 'replace').splitlines()
     text_blocks = []
     block = []
     for line in lines:
         line = line.strip()
-        if line.isdigit() or '-->' in line or not line:
+        # Cheapest separator test first
+        if not line or line.isdigit() or '-->' in line:
             if block:
                 text_blocks.append(' '.join(block))
                 block = []
@@ -24,57 +29,85 @@ def parse_srt_file(filepath: str) -> str:
 
 def extract_season_episode_from_filename(fname: str):
     # Expecting sXXeYY or SXXEYY in filename
-    import re
-    m = re.search(r'[sS](\d+)[eE](\d+)', fname)
+    m = SEASON_EPISODE_RE.search(fname)
     if m:
         return int(m.group(1)), int(m.group(2))
     return None, None
 
+def _prefetch(paths):
+    # Queue kernel readahead for every file at once so the workers' reads
+    # mostly hit the page cache; a no-op where posix_fadvise is missing
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+def _parse_one(entry):
+    fname, path = entry
+    season, episode = extract_season_episode_from_filename(fname)
+    if not season or not episode:
+        return None
+    with open(path, 'rb') as f:
+        data = f.read()
+    return season, episode, fname, parse_srt_file(data)
+
 def ingest_transcripts():
-    session = get_session()
     processed = inserted = updated = skipped = 0
 
-    for fname in os.listdir(SRT_DIR):
-        if fname.endswith('.srt'):
-            season, episode = extract_season_episode_from_filename(fname)
-            if not season or not episode:
-                skipped += 1
-                continue
+    # Parse every file across processes before the connection takes the write lock
+    with os.scandir(SRT_DIR) as it:
+        files = [(e.name, e.path) for e in it if e.name.endswith('.srt')]
+    _prefetch(path for _, path in files)
+    with ProcessPoolExecutor() as ex:
+        parsed = list(ex.map(_parse_one, files, chunksize=8))
 
-            from .id_maps import get_or_create_episode
-            episode_id = get_or_create_episode(season, episode, session)
+    with get_engine().begin() as conn:
+        preload_episodes(conn)
+        existing = load_keys(conn, "SELECT id, episode_id, source_file FROM transcripts")
+        to_insert, to_update = [], []
 
+        for item in parsed:
+            if item is None:
+                skipped += 1
+                continue
             # FIX 1: avoid shadowing SQLAlchemy text()
-            transcript_text = parse_srt_file(os.path.join(SRT_DIR, fname))
+            season, episode, fname, transcript_text = item
 
-            # Check if transcript exists
-            row = session.execute(
-                text("SELECT id FROM transcripts "
-                     "WHERE episode_id = :episode_id AND source_file = :source_file"),
-                {"episode_id": episode_id, "source_file": fname}
-            ).fetchone()
+            episode_id = EPISODE_MAP.get((season, episode)) or get_or_create_episode(season, episode, conn)
 
-            if row:
-                session.execute(
-                    text("UPDATE transcripts SET text = :text WHERE id = :id"),
-                    {"text": transcript_text, "id": row[0]}
-                )
+            # Check if transcript exists
+            existing_id = existing.get((episode_id, fname))
+            if existing_id:
+                to_update.append({"text": transcript_text, "id": existing_id})
                 updated += 1
             else:
-                # FIX 2: corrected missing parenthesis in VALUES()
-                session.execute(
-                    text("INSERT INTO transcripts (episode_id, text, source_file) "
-                         "VALUES (:episode_id, :text, :source_file)"),
-                    {"episode_id": episode_id, "text": transcript_text, "source_file": fname}
-                )
+                to_insert.append({"episode_id": episode_id, "text": transcript_text, "source_file": fname})
                 inserted += 1
 
             processed += 1
 
-    session.commit()
+        if to_update:
+            conn.execute(
+                text("UPDATE transcripts SET text = :text WHERE id = :id"),
+                to_update
+            )
+        if to_insert:
+            # FIX 2: corrected missing parenthesis in VALUES()
+            conn.execute(
+                text("INSERT INTO transcripts (episode_id, text, source_file) "
+                     "VALUES (:episode_id, :text, :source_file)"),
+                to_insert
+            )
+
     log_info('ingest_transcripts',
              processed=processed,
              inserted=inserted,
              updated=updated,
              skipped=skipped)
-    session.close()
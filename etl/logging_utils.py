@@ -1,15 +1,24 @@
+import os
 import sys
-import json
+import orjson
 from datetime import datetime
 
+# Per-row debug events (e.g. id-map cache hits) are off unless requested
+DEBUG_ENABLED = os.getenv('OAK_ISLAND_LOG_DEBUG') == '1'
+
 def _log(level: str, msg: str, **kwargs):
     log_entry = {
-        'time': datetime.utcnow().isoformat(),
+        'time': datetime.utcnow(),  # orjson writes the same ISO 8601 string
         'level': level,
         'msg': msg,
     }
     log_entry.update(kwargs)
-    print(json.dumps(log_entry), file=sys.stderr)
+    # One write per entry; stderr is looked up per call so redirection still works
+    sys.stderr.write(orjson.dumps(log_entry, option=orjson.OPT_APPEND_NEWLINE).decode())
+
+def log_debug(msg: str, **kwargs):
+    if DEBUG_ENABLED:
+        _log('DEBUG', msg, **kwargs)
 
 def log_info(msg: str, **kwargs):
     _log('INFO', msg, **kwargs)
@@ -1,3 +1,5 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from .db import init_db
 from .ingest_core import (
     ingest_episodes, ingest_locations, ingest_artifacts, ingest_boreholes,
@@ -9,41 +11,63 @@ from .ingest_links import (
 )
 from .ingest_transcripts import ingest_transcripts
 from .ingest_geo import ingest_geometries, register_lidar_files
-from .views import refresh_materialized_views
+from .views import refresh_materialized_views, rebuild_text_search
 from .logging_utils import log_info
 
 
-def main():
-    log_info('etl_orchestrator_start')
-    steps = [
-        ("init_db", init_db),
+# Steps within a phase only depend on earlier phases, so each phase runs in
+# its own process pool
+PHASES = [
+    [("init_db", init_db)],
+    [
         ("ingest_episodes", ingest_episodes),
         ("ingest_locations", ingest_locations),
+        ("ingest_people", ingest_people),
+    ],
+    [
         ("ingest_artifacts", ingest_artifacts),
         ("ingest_boreholes", ingest_boreholes),
-        ("ingest_borehole_intervals", ingest_borehole_intervals),
         ("ingest_measurements", ingest_measurements),
         ("ingest_theories", ingest_theories),
-        ("ingest_people", ingest_people),
         ("ingest_events", ingest_events),
-        ("build_event_people_links", build_event_people_links),
-        ("build_event_location_links", build_event_location_links),
-        ("build_artifact_episode_links", build_artifact_episode_links),
+    ],
+    [
+        ("ingest_borehole_intervals", ingest_borehole_intervals),
         ("ingest_transcripts", ingest_transcripts),
         ("ingest_geometries", ingest_geometries),
         ("register_lidar_files", register_lidar_files),
+    ],
+    [
+        ("build_event_people_links", build_event_people_links),
+        ("build_event_location_links", build_event_location_links),
+        ("build_artifact_episode_links", build_artifact_episode_links),
+    ],
+    [
         ("refresh_materialized_views", refresh_materialized_views),
-    ]
+        ("rebuild_text_search", rebuild_text_search),
+    ],
+]
+
+
+def _run_step(step):
+    name, func = step
+    try:
+        log_info(f'start_{name}')
+        func()
+        log_info(f'end_{name}', status='success')
+        return name, 'success'
+    except Exception as e:
+        log_info(f'end_{name}', status='error', error=str(e))
+        return name, f'error: {e}'
+
+
+def main():
+    log_info('etl_orchestrator_start')
     summary = {}
-    for name, func in steps:
-        try:
-            log_info(f'start_{name}')
-            func()
-            log_info(f'end_{name}', status='success')
-            summary[name] = 'success'
-        except Exception as e:
-            log_info(f'end_{name}', status='error', error=str(e))
-            summary[name] = f'error: {e}'
+    for phase in PHASES:
+        # Fresh workers per phase; the parent never opens a DB connection to fork
+        with ProcessPoolExecutor(max_workers=min(len(phase), os.cpu_count() or 1)) as ex:
+            summary.update(ex.map(_run_step, phase))
     log_info('etl_orchestrator_complete', summary=summary)
 
 if __name__ == '__main__':
@@ -1,34 +1,42 @@
 from sqlalchemy import text
-from .db import get_session
+from .db import get_engine, TEXT_SEARCH_TABLES
 from .logging_utils import log_info
 
+# Summary tables are created by init_db (schema.sql) and refilled in place,
+# so the schema never changes under readers
+VIEW_SQL = {
+    'episodes_list': "SELECT id, season, episode, title, air_date FROM episodes",
+    'locations_min': "SELECT id, name, type, lat, lng FROM locations",
+    'theories_summary': "SELECT theory, COUNT(*) as count, MIN(timestamp) as first_mention, MAX(timestamp) as last_mention FROM theories GROUP BY theory",
+    'people_summary': "SELECT name, COUNT(*) as mention_count FROM people GROUP BY name",
+    'artifacts_summary': "SELECT a.id, a.name, a.type, l.name as location, a.season, a.episode, a.confidence FROM artifacts a LEFT JOIN locations l ON a.location_id = l.id",
+    'boreholes_summary': "SELECT b.id, b.name, l.name as location, b.max_depth_m, b.drill_method, b.era FROM boreholes b LEFT JOIN locations l ON b.location_id = l.id",
+    'database_metadata': "SELECT (SELECT COUNT(*) FROM episodes) as episode_count, (SELECT COUNT(*) FROM events) as event_count, (SELECT COUNT(*) FROM locations) as location_count, (SELECT COUNT(*) FROM artifacts) as artifact_count, (SELECT COUNT(*) FROM boreholes) as borehole_count, (SELECT COUNT(*) FROM measurements) as measurement_count, (SELECT COUNT(*) FROM theories) as theory_count, (SELECT COUNT(*) FROM people) as people_count",
+}
+
 
 def refresh_materialized_views():
-    session = get_session()
-    # SQLite: drop and recreate tables for materialized views
-    # episodes_list
-    session.execute(text("DROP TABLE IF EXISTS episodes_list"))
-    session.execute(text("CREATE TABLE episodes_list AS SELECT id, season, episode, title, air_date FROM episodes"))
-    # locations_min
-    session.execute(text("DROP TABLE IF EXISTS locations_min"))
-    session.execute(text("CREATE TABLE locations_min AS SELECT id, name, type, lat, lng FROM locations"))
-    # theories_summary
-    session.execute(text("DROP TABLE IF EXISTS theories_summary"))
-    session.execute(text("CREATE TABLE theories_summary AS SELECT theory, COUNT(*) as count, MIN(timestamp) as first_mention, MAX(timestamp) as last_mention FROM theories GROUP BY theory"))
-    # people_summary
-    session.execute(text("DROP TABLE IF EXISTS people_summary"))
-    session.execute(text("CREATE TABLE people_summary AS SELECT name, COUNT(*) as mention_count FROM people GROUP BY name"))
-    # artifacts_summary
-    session.execute(text("DROP TABLE IF EXISTS artifacts_summary"))
-    session.execute(text("CREATE TABLE artifacts_summary AS SELECT a.id, a.name, a.type, l.name as location, a.season, a.episode, a.confidence FROM artifacts a LEFT JOIN locations l ON a.location_id = l.id"))
-    # boreholes_summary
-    session.execute(text("DROP TABLE IF EXISTS boreholes_summary"))
-    session.execute(text("CREATE TABLE boreholes_summary AS SELECT b.id, b.name, l.name as location, b.max_depth_m, b.drill_method, b.era FROM boreholes b LEFT JOIN locations l ON b.location_id = l.id"))
-    # database_metadata
-    session.execute(text("DROP TABLE IF EXISTS database_metadata"))
-    session.execute(text("CREATE TABLE database_metadata AS SELECT (SELECT COUNT(*) FROM episodes) as episode_count, (SELECT COUNT(*) FROM events) as event_count, (SELECT COUNT(*) FROM locations) as location_count, (SELECT COUNT(*) FROM artifacts) as artifact_count, (SELECT COUNT(*) FROM boreholes) as borehole_count, (SELECT COUNT(*) FROM measurements) as measurement_count, (SELECT COUNT(*) FROM theories) as theory_count, (SELECT COUNT(*) FROM people) as people_count"))
-    session.commit()
+    with get_engine().begin() as conn:
+        for name, sel in VIEW_SQL.items():
+            conn.execute(text(f"DELETE FROM {name}"))
+            conn.execute(text(f"INSERT INTO {name} {sel}"))
+        # Refresh planner statistics now that every table is loaded
+        conn.execute(text("ANALYZE"))
     log_info('refresh_materialized_views', status='complete')
-    session.close()
 
 # For Postgres: use REFRESH MATERIALIZED VIEW view_name; for each view.
+
+
+def rebuild_text_search():
+    with get_engine().begin() as conn:
+        if conn.dialect.name == 'sqlite':
+            # Triggers keep the *_fts tables in sync. A full reindex after each
+            # load also repairs any drift.
+            for table in TEXT_SEARCH_TABLES:
+                conn.execute(text(f"INSERT INTO {table}_fts({table}_fts) VALUES('rebuild')"))
+        else:
+            # Postgres: pg_trgm GIN indexes serve LOWER(text) LIKE '%q%' directly
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for table in TEXT_SEARCH_TABLES:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{table}_text_trgm ON {table} USING gin (LOWER(text) gin_trgm_ops)"))
+    log_info('rebuild_text_search', status='complete')
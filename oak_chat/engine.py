@@ -1,32 +1,110 @@
 # oak_chat/engine.py
 
 
-from typing import Dict, Any
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from oak_chat.router import route_query
 from oak_chat.prompt_template import build_prompt
-import openai
+from openai import AsyncOpenAI, OpenAI
 import logging
 
 # Configure module-level logger
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
-def call_llm(prompt: str) -> str:
+MODEL = "gpt-4o-mini"
+# Upper bound on in-flight LLM requests, to stay inside the account's RPM/TPM limits
+MAX_CONCURRENT_REQUESTS = 8
+# The client retries 429/5xx itself, with exponential backoff that honours retry-after
+MAX_RETRIES = 5
+# Batch API jobs finish within this window, at about half the per-token price
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INTERVAL = 30.0
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+# Answers to identical prompts are reused for an hour; oldest entries go first when full
+LLM_CACHE_MAXSIZE = 4096
+LLM_CACHE_TTL = 3600
+
+_llm_cache: Dict[bytes, Tuple[float, str]] = {}
+_llm_cache_lock = threading.Lock()
+
+# Shared by every synchronous answer_query call, so its HTTPS connections are reused
+_sync_client: Optional[OpenAI] = None
+
+
+def _get_sync_client() -> OpenAI:
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = OpenAI(max_retries=MAX_RETRIES)
+    return _sync_client
+
+
+def _llm_cache_key(prompt: str) -> bytes:
+    return hashlib.blake2b(f"{MODEL}\0{prompt}".encode("utf-8"), digest_size=16).digest()
+
+
+def _llm_cache_get(key: bytes) -> Optional[str]:
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+
+def _llm_cache_put(key: bytes, answer: str) -> None:
+    with _llm_cache_lock:
+        _llm_cache.pop(key, None)
+        while len(_llm_cache) >= LLM_CACHE_MAXSIZE:
+            del _llm_cache[next(iter(_llm_cache))]
+        _llm_cache[key] = (time.monotonic() + LLM_CACHE_TTL, answer)
+
+
+def _chat_body(prompt: str, service_tier: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Chat completion request body, shared by live calls and Batch API lines.
+    service_tier="flex" trades latency for batch-like pricing on a live call.
+    """
+    body = {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": "You are the Oak Island Research Assistant."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.2,
+        "max_tokens": 800,
+    }
+    if service_tier:
+        body["service_tier"] = service_tier
+    return body
+
+
+async def call_llm(prompt: str, client: AsyncOpenAI, service_tier: Optional[str] = None) -> str:
     """
     Call the LLM with the given prompt. Adds logging and error handling.
     """
     logger.info("Calling LLM with prompt of length %d", len(prompt))
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are the Oak Island Research Assistant."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,
-            max_tokens=800
-        )
-        content = response["choices"][0]["message"]["content"]
+        response = await client.chat.completions.create(**_chat_body(prompt, service_tier))
+        content = response.choices[0].message.content
+        logger.debug("LLM response received (length %d)", len(content))
+        return content
+    except Exception as exc:
+        logger.exception("Error calling LLM: %s", exc)
+        raise
+
+
+def call_llm_sync(prompt: str, service_tier: Optional[str] = None) -> str:
+    """
+    Blocking call_llm on the shared synchronous client.
+    """
+    logger.info("Calling LLM with prompt of length %d", len(prompt))
+    try:
+        response = _get_sync_client().chat.completions.create(**_chat_body(prompt, service_tier))
+        content = response.choices[0].message.content
         logger.debug("LLM response received (length %d)", len(content))
         return content
     except Exception as exc:
@@ -35,22 +113,85 @@ def call_llm(prompt: str) -> str:
 
 
 
-def answer_query(user_query: str) -> Dict[str, Any]:
+async def answer_query_async(user_query: str, client: AsyncOpenAI, semaphore: asyncio.Semaphore, service_tier: Optional[str] = None) -> Dict[str, Any]:
     """
     End-to-end chatbot engine:
-    - route the query
+    - route the query (in a worker thread, so DB work doesn't block the loop)
     - build a prompt
-    - call the LLM
+    - call the LLM, holding the semaphore for the request, unless the prompt's answer is cached
     - return structured result
     Adds logging and robust orchestration.
     """
     logger.info("Answering user query: %r", user_query)
+    try:
+        routed = await asyncio.to_thread(route_query, user_query)
+        logger.debug("Routing result: %r", routed)
+        prompt = build_prompt(user_query, routed)
+        logger.debug("Prompt built (length %d)", len(prompt))
+        cache_key = _llm_cache_key(prompt)
+        answer = _llm_cache_get(cache_key)
+        if answer is None:
+            async with semaphore:
+                answer = await call_llm(prompt, client, service_tier)
+            _llm_cache_put(cache_key, answer)
+        else:
+            logger.debug("LLM answer served from cache")
+        logger.info("LLM answer generated (length %d)", len(answer))
+        return {
+            "query": user_query,
+            "route": routed,
+            "prompt": prompt,
+            "answer": answer,
+        }
+    except Exception as exc:
+        logger.exception("Error in answer_query pipeline: %s", exc)
+        return {
+            "query": user_query,
+            "route": None,
+            "prompt": None,
+            "answer": None,
+            "error": str(exc),
+        }
+
+
+async def answer_queries_async(user_queries: List[str], max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS, service_tier: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Answer many queries concurrently, at most max_concurrent_requests LLM calls at a time.
+    Results come back in the order of user_queries.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+    # Client and semaphore live inside one event loop, so each run makes its own
+    async with AsyncOpenAI(max_retries=MAX_RETRIES) as client:
+        return await asyncio.gather(*(answer_query_async(q, client, semaphore, service_tier) for q in user_queries))
+
+
+def answer_queries(user_queries: List[str], max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS, service_tier: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Synchronous wrapper around answer_queries_async, for callers without an event loop.
+    """
+    return asyncio.run(answer_queries_async(user_queries, max_concurrent_requests, service_tier))
+
+
+def answer_query(user_query: str, service_tier: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Synchronous single-query entry point, used by the /chat endpoint.
+    Runs on the shared sync client rather than starting an event loop and a fresh
+    client (and TLS handshake) per request. Code already running in an event loop
+    should await answer_query_async instead.
+    """
+    logger.info("Answering user query: %r", user_query)
     try:
         routed = route_query(user_query)
         logger.debug("Routing result: %r", routed)
         prompt = build_prompt(user_query, routed)
         logger.debug("Prompt built (length %d)", len(prompt))
-        answer = call_llm(prompt)
+        cache_key = _llm_cache_key(prompt)
+        answer = _llm_cache_get(cache_key)
+        if answer is None:
+            answer = call_llm_sync(prompt, service_tier)
+            _llm_cache_put(cache_key, answer)
+        else:
+            logger.debug("LLM answer served from cache")
         logger.info("LLM answer generated (length %d)", len(answer))
         return {
             "query": user_query,
@@ -67,3 +208,57 @@ def answer_query(user_query: str) -> Dict[str, Any]:
             "answer": None,
             "error": str(exc),
         }
+
+
+def answer_queries_batch(user_queries: List[str], poll_interval: float = BATCH_POLL_INTERVAL) -> List[Dict[str, Any]]:
+    """
+    Answer many queries through the OpenAI Batch API, for offline and bulk runs
+    (re-answering a question corpus, evals) where latency doesn't matter.
+    Blocks until the batch finishes; results have the answer_query shape, in order.
+    """
+    logger.info("Answering %d queries via the Batch API", len(user_queries))
+    results: List[Dict[str, Any]] = []
+    lines: List[str] = []
+    for i, user_query in enumerate(user_queries):
+        routed = route_query(user_query)
+        prompt = build_prompt(user_query, routed)
+        results.append({"query": user_query, "route": routed, "prompt": prompt, "answer": None})
+        lines.append(json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _chat_body(prompt),
+        }))
+
+    client = _get_sync_client()
+    batch_file = client.files.create(file=("queries.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+    logger.info("Batch %s submitted", batch.id)
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        logger.debug("Batch %s status: %s", batch.id, batch.status)
+    logger.info("Batch %s finished with status %s", batch.id, batch.status)
+
+    # Successful lines land in the output file, failed ones in the error file
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line:
+                continue
+            item = json.loads(line)
+            result = results[int(item["custom_id"])]
+            response = item.get("response") or {}
+            if response.get("status_code") == 200:
+                result["answer"] = response["body"]["choices"][0]["message"]["content"]
+            else:
+                result["error"] = str(item.get("error") or response.get("body"))
+    for result in results:
+        if result["answer"] is None and "error" not in result:
+            result["error"] = f"Batch {batch.id} ended with status {batch.status}"
+    return results
@@ -1,6 +1,7 @@
 # oak_chat/prompt_template.py
 
 
+from itertools import islice
 from typing import Dict, Any, List, Optional
 import logging
 
@@ -27,6 +28,12 @@ You must:
 - Do NOT invent facts or speculate beyond the provided context.
 """
 
+# Per-bucket caps on what build_context_block sends to the LLM. Input tokens
+# drive both cost and time-to-first-token, and a location summary or fallback
+# fills three buckets, so each keeps its first rows in the query's own order
+MAX_ROWS_PER_BUCKET = 10
+SNIPPET_MAX_CHARS = 160
+
 
 
 def build_context_block(routed: Dict[str, Any]) -> str:
@@ -44,24 +51,28 @@ def build_context_block(routed: Dict[str, Any]) -> str:
             logger.debug("No rows for label '%s'", label)
             return
         lines.append(f"\n[{label}]")
-        for r in rows[:50]:
-            parts = []
-            if isinstance(r, dict):
-                if "season" in r and "episode" in r:
-                    parts.append(f"S{r.get('season')}E{r.get('episode')}")
-                if "title" in r and r.get("title"):
-                    parts.append(str(r["title"]))
-                if "timestamp" in r and r.get("timestamp"):
-                    parts.append(f"@{r['timestamp']}")
-                if "event_type" in r and r.get("event_type"):
-                    parts.append(f"({r['event_type']})")
-                text = r.get("text", "")
-                snippet = text if isinstance(text, str) and len(text) <= 260 else (text[:257] + "..." if isinstance(text, str) else "")
-                parts.append(f": {snippet}")
-                lines.append(" - " + " ".join(parts))
-            else:
+        for r in islice(rows, MAX_ROWS_PER_BUCKET):
+            if not isinstance(r, dict):
                 logger.warning("Row is not a dict: %r", r)
                 lines.append(f" - [Malformed row: {r}]")
+                continue
+            get = r.get
+            episode = f"S{r['season']}E{r['episode']} " if "season" in r and "episode" in r else ""
+            title = get("title")
+            timestamp = get("timestamp")
+            event_type = get("event_type")
+            text = get("text", "")
+            if isinstance(text, str):
+                snippet = text if len(text) <= SNIPPET_MAX_CHARS else text[:SNIPPET_MAX_CHARS - 3] + "..."
+            else:
+                snippet = ""
+            lines.append(
+                f" - {episode}"
+                f"{f'{title} ' if title else ''}"
+                f"{f'@{timestamp} ' if timestamp else ''}"
+                f"{f'({event_type}) ' if event_type else ''}"
+                f": {snippet}"
+            )
 
     # Shape context based on query type
     if t in ("theories_by_term", "theories"):
@@ -95,18 +106,19 @@ def build_context_block(routed: Dict[str, Any]) -> str:
 
 
 
+# Static parts of build_prompt, joined around the per-call question and context
+_PROMPT_PREFIX = SYSTEM_PROMPT + "\n\nUser question:\n"
+_PROMPT_MID = "\n\n"
+_PROMPT_SUFFIX = """
+
+Now, answer the user's question using ONLY the context above.
+Be concise but clear. If relevant, reference episodes as (SxEy).
+If the answer is uncertain or partial, say so explicitly."""
+
+
 def build_prompt(user_query: str, routed: Dict[str, Any]) -> str:
     """
     Build the full prompt for the LLM, including the system prompt, user question, and context block.
     """
     context_block = build_context_block(routed)
-    return f"""{SYSTEM_PROMPT}
-
-User question:
-{user_query}
-
-{context_block}
-
-Now, answer the user's question using ONLY the context above.
-Be concise but clear. If relevant, reference episodes as (SxEy).
-If the answer is uncertain or partial, say so explicitly."""
+    return "".join((_PROMPT_PREFIX, user_query, _PROMPT_MID, context_block, _PROMPT_SUFFIX))
@@ -1,15 +1,21 @@
 # oak_chat/queries.py
 
 
+import re
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from sqlalchemy import text
-from etl.db import get_session
+from sqlalchemy.orm import sessionmaker
+from etl.db import get_read_engine, text_search_in_sync, TEXT_SEARCH_TABLES
 import logging
 
 # Configure module-level logger
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+# Built once; each session checks a connection out of the read engine's pool
+Session = sessionmaker(bind=get_read_engine(), autoflush=False, expire_on_commit=False)
+
 
 # ---------- helpers ----------
 
@@ -29,6 +35,29 @@ def _rows_to_dicts(result, rows) -> List[Dict[str, Any]]:
     return [dict(zip(cols, row)) for row in rows]
 
 
+# :name placeholders, but not :: casts or the digits in literals like '99:99'
+_NAMED_PARAM_RE = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+
+def _raw_fetch(session, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Run a read query on the session's DBAPI cursor and build the dicts straight
+    from its rows, skipping SQLAlchemy's bind and row processing.
+    sql uses :name placeholders, which sqlite3 takes natively; for the
+    format-style drivers (psycopg2) they are rewritten to %(name)s.
+    """
+    conn = session.connection()
+    if conn.dialect.paramstyle in ("format", "pyformat"):
+        sql = _NAMED_PARAM_RE.sub(r"%(\1)s", sql.replace("%", "%%"))
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(sql, params)
+        cols = [d[0] for d in cursor.description]
+        return [dict(zip(cols, row)) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
 # Context manager for session handling
 from contextlib import contextmanager
 
@@ -38,7 +67,7 @@ def session_scope():
     Provide a transactional scope around a series of operations.
     Ensures session is closed and logs errors.
     """
-    session = get_session()
+    session = Session()
     try:
         yield session
     except Exception as exc:
@@ -48,6 +77,43 @@ def session_scope():
         session.close()
 
 
+@lru_cache(maxsize=1)
+def _fts_tables() -> frozenset:
+    """
+    Tables from TEXT_SEARCH_TABLES whose trigram index exists and covers every row.
+    A table whose index is missing or still unbuilt is scanned with LIKE instead,
+    so searches never come back empty just because the index lags.
+    Postgres serves LOWER(text) LIKE from pg_trgm indexes instead, so it never has any.
+    """
+    engine = get_read_engine()
+    if engine.dialect.name != "sqlite":
+        return frozenset()
+    with engine.connect() as conn:
+        return frozenset(table for table in TEXT_SEARCH_TABLES if text_search_in_sync(conn, table))
+
+
+def _text_match(table: str, alias: str) -> str:
+    """
+    SQL condition for "alias.text contains :pattern", looked up in the table's
+    trigram index when it has one rather than scanning every row.
+    """
+    if table in _fts_tables():
+        return f"{alias}.id IN (SELECT rowid FROM {table}_fts WHERE text LIKE :pattern)"
+    return f"LOWER({alias}.text) LIKE :pattern"
+
+
+def _episode_mention_match() -> str:
+    """
+    SQL condition for episodes (alias ep) with an event, theory or transcript matching :pattern.
+    A pattern that matches the empty string (an empty term) matches every episode.
+    """
+    subqueries = " OR ".join(
+        f"ep.id IN (SELECT {alias}.episode_id FROM {table} {alias} WHERE {_text_match(table, alias)})"
+        for table, alias in (("events", "e"), ("theories", "t"), ("transcripts", "tr"))
+    )
+    return f"'' LIKE :pattern OR {subqueries}"
+
+
 # ---------- core episode queries ----------
 
 def get_episode_by_season_episode(season: int, episode: int) -> Optional[Dict[str, Any]]:
@@ -79,25 +145,19 @@ def find_episodes_mentioning_person(name: str) -> List[Dict[str, Any]]:
     logger.debug("Searching for episodes mentioning person: %s", name)
     with session_scope() as session:
         pattern = f"%{name.lower()}%"
-        result = session.execute(
-            text("""
+        return _raw_fetch(
+            session,
+            f"""
                 SELECT DISTINCT ep.id,
                        ep.season,
                        ep.episode,
                        ep.title
                 FROM episodes ep
-                LEFT JOIN events e ON e.episode_id = ep.id
-                LEFT JOIN theories t ON t.episode_id = ep.id
-                LEFT JOIN transcripts tr ON tr.episode_id = ep.id
-                WHERE LOWER(COALESCE(e.text, '')) LIKE :pattern
-                   OR LOWER(COALESCE(t.text, '')) LIKE :pattern
-                   OR LOWER(COALESCE(tr.text, '')) LIKE :pattern
+                WHERE {_episode_mention_match()}
                 ORDER BY ep.season, ep.episode
-            """),
+            """,
             {"pattern": pattern}
         )
-        rows = result.fetchall()
-        return _rows_to_dicts(result, rows)
 
 
 def find_episodes_mentioning_term(term: str) -> List[Dict[str, Any]]:
@@ -116,8 +176,9 @@ def search_events_text(query: str, limit: int = 50) -> List[Dict[str, Any]]:
     logger.debug("Searching events text for query: '%s' (limit %d)", query, limit)
     with session_scope() as session:
         pattern = f"%{query.lower()}%"
-        result = session.execute(
-            text("""
+        return _raw_fetch(
+            session,
+            f"""
                 SELECT e.id,
                        e.episode_id,
                        ep.season,
@@ -128,14 +189,12 @@ def search_events_text(query: str, limit: int = 50) -> List[Dict[str, Any]]:
                        e.text
                 FROM events e
                 JOIN episodes ep ON ep.id = e.episode_id
-                WHERE LOWER(e.text) LIKE :pattern
+                WHERE {_text_match('events', 'e')}
                 ORDER BY ep.season, ep.episode, e.timestamp
                 LIMIT :limit
-            """),
+            """,
             {"pattern": pattern, "limit": limit}
         )
-        rows = result.fetchall()
-        return _rows_to_dicts(result, rows)
 
 
 def search_theories_text(query: str, limit: int = 50) -> List[Dict[str, Any]]:
@@ -145,8 +204,9 @@ def search_theories_text(query: str, limit: int = 50) -> List[Dict[str, Any]]:
     logger.debug("Searching theories text for query: '%s' (limit %d)", query, limit)
     with session_scope() as session:
         pattern = f"%{query.lower()}%"
-        result = session.execute(
-            text("""
+        return _raw_fetch(
+            session,
+            f"""
                 SELECT t.id,
                        t.episode_id,
                        ep.season,
@@ -155,14 +215,12 @@ def search_theories_text(query: str, limit: int = 50) -> List[Dict[str, Any]]:
                        t.text
                 FROM theories t
                 JOIN episodes ep ON ep.id = t.episode_id
-                WHERE LOWER(t.text) LIKE :pattern
+                WHERE {_text_match('theories', 't')}
                 ORDER BY ep.season, ep.episode, t.id
                 LIMIT :limit
-            """),
+            """,
             {"pattern": pattern, "limit": limit}
         )
-        rows = result.fetchall()
-        return _rows_to_dicts(result, rows)
 
 
 def search_transcripts_text(query: str, limit: int = 50) -> List[Dict[str, Any]]:
@@ -172,8 +230,9 @@ def search_transcripts_text(query: str, limit: int = 50) -> List[Dict[str, Any]]
     logger.debug("Searching transcripts text for query: '%s' (limit %d)", query, limit)
     with session_scope() as session:
         pattern = f"%{query.lower()}%"
-        result = session.execute(
-            text("""
+        return _raw_fetch(
+            session,
+            f"""
                 SELECT tr.id,
                        tr.episode_id,
                        ep.season,
@@ -182,14 +241,12 @@ def search_transcripts_text(query: str, limit: int = 50) -> List[Dict[str, Any]]
                        tr.text
                 FROM transcripts tr
                 JOIN episodes ep ON ep.id = tr.episode_id
-                WHERE LOWER(tr.text) LIKE :pattern
+                WHERE {_text_match('transcripts', 'tr')}
                 ORDER BY ep.season, ep.episode, tr.id
                 LIMIT :limit
-            """),
+            """,
             {"pattern": pattern, "limit": limit}
         )
-        rows = result.fetchall()
-        return _rows_to_dicts(result, rows)
 
 
 # ---------- location / timeline helpers ----------
@@ -208,58 +265,214 @@ def timeline_for_term(term: str, limit_per_source: int = 50) -> List[Dict[str, A
     logger.debug("Building timeline for term: '%s' (limit per source: %d)", term, limit_per_source)
     with session_scope() as session:
         pattern = f"%{term.lower()}%"
-        result = session.execute(
-            text("""
-                SELECT 'event' AS source,
-                       e.id AS source_id,
-                       e.episode_id,
-                       ep.season,
-                       ep.episode,
-                       ep.title,
-                       e.timestamp,
-                       e.event_type AS subtype,
-                       e.text
-                FROM events e
-                JOIN episodes ep ON ep.id = e.episode_id
-                WHERE LOWER(e.text) LIKE :pattern
-
-                UNION ALL
-
-                SELECT 'theory' AS source,
-                       t.id AS source_id,
-                       t.episode_id,
-                       ep.season,
-                       ep.episode,
-                       ep.title,
-                       NULL AS timestamp,
-                       NULL AS subtype,
-                       t.text
-                FROM theories t
-                JOIN episodes ep ON ep.id = t.episode_id
-                WHERE LOWER(t.text) LIKE :pattern
-
+        return _raw_fetch(
+            session,
+            f"""
+                -- A compound SELECT can only ORDER BY plain columns, so sort the union as a subquery
+                SELECT *
+                FROM (
+                    SELECT 'event' AS source,
+                           e.id AS source_id,
+                           e.episode_id,
+                           ep.season,
+                           ep.episode,
+                           ep.title,
+                           e.timestamp,
+                           e.event_type AS subtype,
+                           e.text
+                    FROM events e
+                    JOIN episodes ep ON ep.id = e.episode_id
+                    WHERE {_text_match('events', 'e')}
+
+                    UNION ALL
+
+                    SELECT 'theory' AS source,
+                           t.id AS source_id,
+                           t.episode_id,
+                           ep.season,
+                           ep.episode,
+                           ep.title,
+                           NULL AS timestamp,
+                           NULL AS subtype,
+                           t.text
+                    FROM theories t
+                    JOIN episodes ep ON ep.id = t.episode_id
+                    WHERE {_text_match('theories', 't')}
+                ) tl
                 ORDER BY season, episode, COALESCE(timestamp, '99:99:99.999')
                 LIMIT :limit
-            """),
+            """,
             {"pattern": pattern, "limit": limit_per_source}
         )
-        rows = result.fetchall()
-        return _rows_to_dicts(result, rows)
+
+
+# Columns each summarize_location_seed bucket keeps, matching the standalone searches
+SUMMARY_COLUMNS = {
+    "events": ("id", "episode_id", "season", "episode", "title", "timestamp", "event_type", "text"),
+    "theories": ("id", "episode_id", "season", "episode", "title", "text"),
+    "episodes": ("id", "season", "episode", "title"),
+}
 
 
 def summarize_location_seed(name: str, limit: int = 20) -> Dict[str, List[Dict[str, Any]]]:
     """
     Summarize a location by collecting related events, theories, and episodes.
+    All three come back from one UNION ALL query and are split by its source column.
     """
     logger.debug("Summarizing location seed for: '%s' (limit %d)", name, limit)
-    events = search_events_text(name, limit=limit)
-    theories = search_theories_text(name, limit=limit)
-    episodes = episodes_for_location_name(name)
-    return {
-        "events": events,
-        "theories": theories,
-        "episodes": episodes,
-    }
+    with session_scope() as session:
+        pattern = f"%{name.lower()}%"
+        rows = _raw_fetch(
+            session,
+            f"""
+                SELECT 'events' AS source, 0 AS source_rank, ev.*
+                FROM (
+                    SELECT e.id,
+                           e.episode_id,
+                           ep.season,
+                           ep.episode,
+                           ep.title,
+                           e.timestamp,
+                           e.event_type,
+                           e.text
+                    FROM events e
+                    JOIN episodes ep ON ep.id = e.episode_id
+                    WHERE {_text_match('events', 'e')}
+                    ORDER BY ep.season, ep.episode, e.timestamp
+                    LIMIT :limit
+                ) ev
+
+                UNION ALL
+
+                SELECT 'theories' AS source, 1 AS source_rank, th.*
+                FROM (
+                    SELECT t.id,
+                           t.episode_id,
+                           ep.season,
+                           ep.episode,
+                           ep.title,
+                           NULL AS timestamp,
+                           NULL AS event_type,
+                           t.text
+                    FROM theories t
+                    JOIN episodes ep ON ep.id = t.episode_id
+                    WHERE {_text_match('theories', 't')}
+                    ORDER BY ep.season, ep.episode, t.id
+                    LIMIT :limit
+                ) th
+
+                UNION ALL
+
+                SELECT 'episodes' AS source, 2 AS source_rank, eps.*
+                FROM (
+                    SELECT DISTINCT ep.id,
+                           ep.id AS episode_id,
+                           ep.season,
+                           ep.episode,
+                           ep.title,
+                           NULL AS timestamp,
+                           NULL AS event_type,
+                           NULL AS text
+                    FROM episodes ep
+                    WHERE {_episode_mention_match()}
+                ) eps
+
+                ORDER BY source_rank, season, episode, timestamp, id
+            """,
+            {"pattern": pattern, "limit": limit}
+        )
+        return _split_by_source(rows, SUMMARY_COLUMNS)
+
+
+def _split_by_source(rows: List[Dict[str, Any]], columns: Dict[str, tuple]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Bucket UNION ALL rows by their source column, keeping each bucket's own columns.
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = {source: [] for source in columns}
+    for row in rows:
+        buckets[row["source"]].append({col: row[col] for col in columns[row["source"]]})
+    return buckets
+
+
+# Columns each search_all_text bucket keeps, matching the standalone searches
+SEARCH_ALL_COLUMNS = {
+    "events": ("id", "episode_id", "season", "episode", "title", "timestamp", "event_type", "text"),
+    "theories": ("id", "episode_id", "season", "episode", "title", "text"),
+    "transcripts": ("id", "episode_id", "season", "episode", "title", "text"),
+}
+
+
+def search_all_text(query: str, limit: int = 50) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Search events, theories, and transcripts for the query string at once.
+    Same rows as the three search_*_text calls, from one UNION ALL query split by its source column.
+    """
+    logger.debug("Searching all text sources for query: '%s' (limit %d)", query, limit)
+    with session_scope() as session:
+        pattern = f"%{query.lower()}%"
+        rows = _raw_fetch(
+            session,
+            f"""
+                SELECT 'events' AS source, 0 AS source_rank, ev.*
+                FROM (
+                    SELECT e.id,
+                           e.episode_id,
+                           ep.season,
+                           ep.episode,
+                           ep.title,
+                           e.timestamp,
+                           e.event_type,
+                           e.text
+                    FROM events e
+                    JOIN episodes ep ON ep.id = e.episode_id
+                    WHERE {_text_match('events', 'e')}
+                    ORDER BY ep.season, ep.episode, e.timestamp
+                    LIMIT :limit
+                ) ev
+
+                UNION ALL
+
+                SELECT 'theories' AS source, 1 AS source_rank, th.*
+                FROM (
+                    SELECT t.id,
+                           t.episode_id,
+                           ep.season,
+                           ep.episode,
+                           ep.title,
+                           NULL AS timestamp,
+                           NULL AS event_type,
+                           t.text
+                    FROM theories t
+                    JOIN episodes ep ON ep.id = t.episode_id
+                    WHERE {_text_match('theories', 't')}
+                    ORDER BY ep.season, ep.episode, t.id
+                    LIMIT :limit
+                ) th
+
+                UNION ALL
+
+                SELECT 'transcripts' AS source, 2 AS source_rank, trs.*
+                FROM (
+                    SELECT tr.id,
+                           tr.episode_id,
+                           ep.season,
+                           ep.episode,
+                           ep.title,
+                           NULL AS timestamp,
+                           NULL AS event_type,
+                           tr.text
+                    FROM transcripts tr
+                    JOIN episodes ep ON ep.id = tr.episode_id
+                    WHERE {_text_match('transcripts', 'tr')}
+                    ORDER BY ep.season, ep.episode, tr.id
+                    LIMIT :limit
+                ) trs
+
+                ORDER BY source_rank, season, episode, timestamp, id
+            """,
+            {"pattern": pattern, "limit": limit}
+        )
+        return _split_by_source(rows, SEARCH_ALL_COLUMNS)
 
 
 # ---------- theories mentioning X ----------
@@ -1,15 +1,18 @@
 # oak_chat/router.py
 
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, Tuple
 from oak_chat.queries import (
     search_events_text,
     search_theories_text,
     search_transcripts_text,
+    search_all_text,
     find_episodes_mentioning_person,
-    find_episodes_mentioning_term,
     timeline_for_term,
     summarize_location_seed,
     theories_mentioning_term,
+    _fts_tables,
 )
 
 import logging
@@ -19,129 +22,27 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
+ROUTE_CACHE_MAXSIZE = 1024
+# Routed DB rows are reused for five minutes, so an ETL reload shows up without a restart
+ROUTE_CACHE_TTL = 300
+
+_route_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_route_cache_lock = threading.Lock()
+
+
 def route_query(user_query: str) -> Dict[str, Any]:
     """
     Interpret a natural-language question and route it to the correct query function(s).
     Returns a structured dict for the chatbot to summarize.
+    Repeats of a question (after case/whitespace normalization) are served from cache,
+    so callers must treat the returned dict as read-only.
     """
 
     logger.info("Routing user query: %r", user_query)
-    q = user_query.lower().strip()
+    q = " ".join(user_query.lower().split())
 
     try:
-        # ---------- TIMELINE ----------
-        if "timeline" in q:
-            # e.g., "timeline for smith's cove"
-            term = q.replace("timeline", "").replace("for", "").strip()
-            logger.debug("Timeline query detected. Term: '%s'", term)
-            data = timeline_for_term(term)
-            return {
-                "type": "timeline",
-                "term": term,
-                "results": data,
-            }
-
-        # ---------- SUMMARIZE LOCATION ----------
-        if "summarize" in q or "summary" in q:
-            # e.g., "summarize the money pit"
-            term = q.replace("summarize", "").replace("summary", "").strip()
-            logger.debug("Location summary query detected. Term: '%s'", term)
-            data = summarize_location_seed(term)
-            return {
-                "type": "location_summary",
-                "term": term,
-                "results": data,
-            }
-
-        # ---------- THEORIES ----------
-        if "theories" in q or "theory" in q:
-            # e.g., "what theories mention treasure?"
-            if "mention" in q:
-                # extract term after "mention"
-                parts = q.split("mention")
-                term = parts[-1].strip()
-                logger.debug("Theories mentioning term query. Term: '%s'", term)
-                data = theories_mentioning_term(term)
-                return {
-                    "type": "theories_by_term",
-                    "term": term,
-                    "results": data,
-                }
-
-        # ---------- EPISODES MENTIONING PERSON ----------
-        if "episodes" in q and ("mention" in q or "featuring" in q or "with" in q):
-            # e.g., "which episodes mention zena halpern?"
-            parts = q.split("mention") if "mention" in q else q.split("with")
-            term = parts[-1].strip()
-            logger.debug("Episodes mentioning person query. Person: '%s'", term)
-            data = find_episodes_mentioning_person(term)
-            return {
-                "type": "episodes_by_person",
-                "person": term,
-                "results": data,
-            }
-
-        # ---------- GENERIC EPISODE SEARCH ----------
-        if "episodes" in q and "mention" in q:
-            term = q.split("mention")[-1].strip()
-            logger.debug("Episodes mentioning term query. Term: '%s'", term)
-            data = find_episodes_mentioning_term(term)
-            return {
-                "type": "episodes_by_term",
-                "term": term,
-                "results": data,
-            }
-
-        # ---------- EVENT SEARCH ----------
-        if "event" in q or "events" in q:
-            # e.g., "events about the money pit"
-            term = q.replace("events", "").replace("event", "").strip()
-            logger.debug("Events search query. Term: '%s'", term)
-            data = search_events_text(term)
-            return {
-                "type": "events",
-                "term": term,
-                "results": data,
-            }
-
-        # ---------- TRANSCRIPT SEARCH ----------
-        if "transcript" in q or "dialogue" in q or "line" in q:
-            term = q.replace("transcript", "").replace("dialogue", "").replace("line", "").strip()
-            logger.debug("Transcripts search query. Term: '%s'", term)
-            data = search_transcripts_text(term)
-            return {
-                "type": "transcripts",
-                "term": term,
-                "results": data,
-            }
-
-        # ---------- THEORY SEARCH ----------
-        if "treasure" in q or "templar" in q or "theory" in q:
-            # fallback: treat as theory search
-            logger.debug("Fallback theory search. Query: '%s'", q)
-            data = search_theories_text(q)
-            return {
-                "type": "theories",
-                "term": q,
-                "results": data,
-            }
-
-        # ---------- FALLBACK: SEARCH EVERYTHING ----------
-        # If we can't classify the question, search all text sources.
-        logger.debug("Fallback: search all sources for query: '%s'", q)
-        events = search_events_text(q)
-        theories = search_theories_text(q)
-        transcripts = search_transcripts_text(q)
-
-        return {
-            "type": "fallback",
-            "term": q,
-            "results": {
-                "events": events,
-                "theories": theories,
-                "transcripts": transcripts,
-            },
-        }
+        return _route_normalized(q)
     except Exception as exc:
         logger.exception("Error routing query: %r", user_query)
         return {
@@ -150,109 +51,172 @@ def route_query(user_query: str) -> Dict[str, Any]:
             "error": str(exc),
         }
 
-    q = user_query.lower().strip()
 
-    # ---------- TIMELINE ----------
-    if "timeline" in q:
-        # e.g., "timeline for smith's cove"
-        term = q.replace("timeline", "").replace("for", "").strip()
-        data = timeline_for_term(term)
-        return {
-            "type": "timeline",
-            "term": term,
-            "results": data,
-        }
+def _route_normalized(q: str) -> Dict[str, Any]:
+    """
+    Route an already-normalized query, reusing a result routed within ROUTE_CACHE_TTL.
+    Errors propagate to route_query, so they are never cached.
+    """
+    now = time.monotonic()
+    with _route_cache_lock:
+        entry = _route_cache.get(q)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    routed = _ROUTES[_classify(q)](q)
+    with _route_cache_lock:
+        _route_cache.pop(q, None)
+        while len(_route_cache) >= ROUTE_CACHE_MAXSIZE:
+            del _route_cache[next(iter(_route_cache))]
+        _route_cache[q] = (now + ROUTE_CACHE_TTL, routed)
+    return routed
+
+
+def clear_route_cache() -> int:
+    """
+    Drop every cached route after a database reload, and recheck which text
+    indexes are complete. Returns the number of routes dropped.
+    """
+    with _route_cache_lock:
+        dropped = len(_route_cache)
+        _route_cache.clear()
+    _fts_tables.cache_clear()
+    return dropped
 
-    # ---------- SUMMARIZE LOCATION ----------
-    if "summarize" in q or "summary" in q:
-        # e.g., "summarize the money pit"
-        term = q.replace("summarize", "").replace("summary", "").strip()
-        data = summarize_location_seed(term)
-        return {
-            "type": "location_summary",
-            "term": term,
-            "results": data,
-        }
 
-    # ---------- THEORIES ----------
-    if "theories" in q or "theory" in q:
-        # e.g., "what theories mention treasure?"
-        if "mention" in q:
-            # extract term after "mention"
-            parts = q.split("mention")
-            term = parts[-1].strip()
-            data = theories_mentioning_term(term)
-            return {
-                "type": "theories_by_term",
-                "term": term,
-                "results": data,
-            }
-
-    # ---------- EPISODES MENTIONING PERSON ----------
+def _classify(q: str) -> str:
+    """
+    Pick the route for a normalized query from its keywords alone; no DB work.
+    Checks run in priority order, so the first matching route wins. Plain `in`
+    tests are CPython's C substring search; a combined regex scan measured slower.
+    """
+    if "timeline" in q:
+        return "timeline"
+    if "summarize" in q or "summary" in q:
+        return "location_summary"
+    if ("theories" in q or "theory" in q) and "mention" in q:
+        return "theories_by_term"
     if "episodes" in q and ("mention" in q or "featuring" in q or "with" in q):
-        # e.g., "which episodes mention zena halpern?"
-        parts = q.split("mention") if "mention" in q else q.split("with")
-        term = parts[-1].strip()
-        data = find_episodes_mentioning_person(term)
-        return {
-            "type": "episodes_by_person",
-            "person": term,
-            "results": data,
-        }
+        return "episodes_by_person"
+    if "event" in q:
+        return "events"
+    if "transcript" in q or "dialogue" in q or "line" in q:
+        return "transcripts"
+    if "treasure" in q or "templar" in q or "theory" in q:
+        return "theories"
+    return "fallback"
 
-    # ---------- GENERIC EPISODE SEARCH ----------
-    if "episodes" in q and "mention" in q:
-        term = q.split("mention")[-1].strip()
-        data = find_episodes_mentioning_term(term)
-        return {
-            "type": "episodes_by_term",
-            "term": term,
-            "results": data,
-        }
 
-    # ---------- EVENT SEARCH ----------
-    if "event" in q or "events" in q:
-        # e.g., "events about the money pit"
-        term = q.replace("events", "").replace("event", "").strip()
-        data = search_events_text(term)
-        return {
-            "type": "events",
-            "term": term,
-            "results": data,
-        }
+# ---------- TIMELINE ----------
+def _route_timeline(q: str) -> Dict[str, Any]:
+    # e.g., "timeline for smith's cove"
+    term = q.replace("timeline", "").replace("for", "").strip()
+    logger.debug("Timeline query detected. Term: '%s'", term)
+    data = timeline_for_term(term)
+    return {
+        "type": "timeline",
+        "term": term,
+        "results": data,
+    }
 
-    # ---------- TRANSCRIPT SEARCH ----------
-    if "transcript" in q or "dialogue" in q or "line" in q:
-        term = q.replace("transcript", "").replace("dialogue", "").replace("line", "").strip()
-        data = search_transcripts_text(term)
-        return {
-            "type": "transcripts",
-            "term": term,
-            "results": data,
-        }
 
-    # ---------- THEORY SEARCH ----------
-    if "treasure" in q or "templar" in q or "theory" in q:
-        # fallback: treat as theory search
-        data = search_theories_text(q)
-        return {
-            "type": "theories",
-            "term": q,
-            "results": data,
-        }
+# ---------- SUMMARIZE LOCATION ----------
+def _route_location_summary(q: str) -> Dict[str, Any]:
+    # e.g., "summarize the money pit"
+    term = q.replace("summarize", "").replace("summary", "").strip()
+    logger.debug("Location summary query detected. Term: '%s'", term)
+    data = summarize_location_seed(term)
+    return {
+        "type": "location_summary",
+        "term": term,
+        "results": data,
+    }
+
+
+# ---------- THEORIES ----------
+def _route_theories_by_term(q: str) -> Dict[str, Any]:
+    # e.g., "what theories mention treasure?"
+    # extract term after the last "mention"
+    term = q.rpartition("mention")[2].strip()
+    logger.debug("Theories mentioning term query. Term: '%s'", term)
+    data = theories_mentioning_term(term)
+    return {
+        "type": "theories_by_term",
+        "term": term,
+        "results": data,
+    }
+
+
+# ---------- EPISODES MENTIONING PERSON ----------
+def _route_episodes_by_person(q: str) -> Dict[str, Any]:
+    # e.g., "which episodes mention zena halpern?"
+    # rpartition leaves the whole query when "with" is absent (e.g. only "featuring")
+    term = q.rpartition("mention" if "mention" in q else "with")[2].strip()
+    logger.debug("Episodes mentioning person query. Person: '%s'", term)
+    data = find_episodes_mentioning_person(term)
+    return {
+        "type": "episodes_by_person",
+        "person": term,
+        "results": data,
+    }
 
-    # ---------- FALLBACK: SEARCH EVERYTHING ----------
-    # If we can't classify the question, search all text sources.
-    events = search_events_text(q)
-    theories = search_theories_text(q)
-    transcripts = search_transcripts_text(q)
 
+# ---------- EVENT SEARCH ----------
+def _route_events(q: str) -> Dict[str, Any]:
+    # e.g., "events about the money pit"
+    term = q.replace("events", "").replace("event", "").strip()
+    logger.debug("Events search query. Term: '%s'", term)
+    data = search_events_text(term)
+    return {
+        "type": "events",
+        "term": term,
+        "results": data,
+    }
+
+
+# ---------- TRANSCRIPT SEARCH ----------
+def _route_transcripts(q: str) -> Dict[str, Any]:
+    term = q.replace("transcript", "").replace("dialogue", "").replace("line", "").strip()
+    logger.debug("Transcripts search query. Term: '%s'", term)
+    data = search_transcripts_text(term)
+    return {
+        "type": "transcripts",
+        "term": term,
+        "results": data,
+    }
+
+
+# ---------- THEORY SEARCH ----------
+def _route_theories(q: str) -> Dict[str, Any]:
+    # fallback: treat as theory search
+    logger.debug("Fallback theory search. Query: '%s'", q)
+    data = search_theories_text(q)
+    return {
+        "type": "theories",
+        "term": q,
+        "results": data,
+    }
+
+
+# ---------- FALLBACK: SEARCH EVERYTHING ----------
+def _route_fallback(q: str) -> Dict[str, Any]:
+    # If we can't classify the question, search all text sources in one query.
+    logger.debug("Fallback: search all sources for query: '%s'", q)
+    data = search_all_text(q)
     return {
         "type": "fallback",
         "term": q,
-        "results": {
-            "events": events,
-            "theories": theories,
-            "transcripts": transcripts,
-        },
+        "results": data,
     }
+
+
+# Route name (as returned by _classify) -> handler
+_ROUTES = {
+    "timeline": _route_timeline,
+    "location_summary": _route_location_summary,
+    "theories_by_term": _route_theories_by_term,
+    "episodes_by_person": _route_episodes_by_person,
+    "events": _route_events,
+    "transcripts": _route_transcripts,
+    "theories": _route_theories,
+    "fallback": _route_fallback,
+}
@@ -4,6 +4,9 @@ from pathlib import Path
 import json
 
 app = Flask(__name__)
+# Plain compact JSON even under debug; clients must not rely on key order
+app.json.sort_keys = False
+app.json.compact = True
 
 ROOT = Path(__file__).resolve().parents[1]
 PATCH_FILE = ROOT / "data_extracted" / "facts" / "coord_patches.jsonl"
@@ -208,15 +208,65 @@ CREATE INDEX IF NOT EXISTS idx_boreholes_location_id ON boreholes(location_id);
 CREATE INDEX IF NOT EXISTS idx_measurements_episode_id ON measurements(episode_id);
 CREATE INDEX IF NOT EXISTS idx_theories_episode_id ON theories(episode_id);
 CREATE INDEX IF NOT EXISTS idx_people_name ON people(name);
+CREATE INDEX IF NOT EXISTS idx_artifacts_season_episode ON artifacts(season, episode);
+CREATE INDEX IF NOT EXISTS idx_borehole_intervals_borehole_depth ON borehole_intervals(borehole_id, depth_from_m, depth_to_m);
+CREATE INDEX IF NOT EXISTS idx_transcripts_episode_source ON transcripts(episode_id, source_file);
+-- Natural keys the ingesters upsert on. NULLs stay distinct, so rows with a missing key part are always inserted
+CREATE UNIQUE INDEX IF NOT EXISTS idx_measurements_key ON measurements(episode_id, timestamp, measurement_type, value);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_key ON events(episode_id, timestamp, event_type, text);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_theories_key ON theories(episode_id, timestamp, theory, text);
+
+-- =========================
+-- Text Search (trigram FTS5, kept in sync by triggers)
+-- =========================
+
+-- Serve oak_chat's substring search (LOWER(text) LIKE '%q%') from an index
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(text, content='events', content_rowid='id', tokenize='trigram');
+CREATE VIRTUAL TABLE IF NOT EXISTS theories_fts USING fts5(text, content='theories', content_rowid='id', tokenize='trigram');
+CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(text, content='transcripts', content_rowid='id', tokenize='trigram');
+
+-- Keep the text indexes in sync with their tables. init_db rebuilds an index
+-- that is missing rows (a database loaded before these triggers existed)
+CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF text ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO events_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS theories_fts_ai AFTER INSERT ON theories BEGIN
+    INSERT INTO theories_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS theories_fts_ad AFTER DELETE ON theories BEGIN
+    INSERT INTO theories_fts(theories_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS theories_fts_au AFTER UPDATE OF text ON theories BEGIN
+    INSERT INTO theories_fts(theories_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO theories_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_fts_ai AFTER INSERT ON transcripts BEGIN
+    INSERT INTO transcripts_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_fts_ad AFTER DELETE ON transcripts BEGIN
+    INSERT INTO transcripts_fts(transcripts_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_fts_au AFTER UPDATE OF text ON transcripts BEGIN
+    INSERT INTO transcripts_fts(transcripts_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO transcripts_fts(rowid, text) VALUES (new.id, new.text);
+END;
 
 -- =========================
 -- Summary Tables (SQLite replacement for Materialized Views)
 -- =========================
 
-CREATE TABLE IF NOT EXISTS episodes_list AS SELECT * FROM episodes WHERE 0;
-CREATE TABLE IF NOT EXISTS locations_min AS SELECT * FROM locations WHERE 0;
-CREATE TABLE IF NOT EXISTS theories_summary AS SELECT * FROM theories WHERE 0;
-CREATE TABLE IF NOT EXISTS people_summary AS SELECT * FROM people WHERE 0;
-CREATE TABLE IF NOT EXISTS artifacts_summary AS SELECT * FROM artifacts WHERE 0;
-CREATE TABLE IF NOT EXISTS boreholes_summary AS SELECT * FROM boreholes WHERE 0;
-CREATE TABLE IF NOT EXISTS database_metadata AS SELECT 0 AS episode_count;
+-- Column lists match the SELECTs in etl/views.py, which refills these in place
+CREATE TABLE IF NOT EXISTS episodes_list (id INT, season INT, episode INT, title TEXT, air_date TEXT);
+CREATE TABLE IF NOT EXISTS locations_min (id INT, name TEXT, type TEXT, lat REAL, lng REAL);
+CREATE TABLE IF NOT EXISTS theories_summary (theory TEXT, count, first_mention, last_mention);
+CREATE TABLE IF NOT EXISTS people_summary (name TEXT, mention_count);
+CREATE TABLE IF NOT EXISTS artifacts_summary (id INT, name TEXT, type TEXT, location TEXT, season INT, episode INT, confidence REAL);
+CREATE TABLE IF NOT EXISTS boreholes_summary (id INT, name TEXT, location TEXT, max_depth_m REAL, drill_method TEXT, era TEXT);
+CREATE TABLE IF NOT EXISTS database_metadata (episode_count, event_count, location_count, artifact_count, borehole_count, measurement_count, theory_count, people_count);
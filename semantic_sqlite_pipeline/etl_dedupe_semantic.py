@@ -326,6 +326,7 @@ def main():
     
     # Connect to database
     conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA recursive_triggers=ON")  # keep *_fts in sync on REPLACE
     
     # Load and dedupe people
     logger.info("=== PEOPLE DEDUPLICATION ===")
@@ -332,6 +332,7 @@ def main():
     
     # Create/connect database
     conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA recursive_triggers=ON")  # keep *_fts in sync on REPLACE
     cursor = conn.cursor()
     
     # Load schema
@@ -261,6 +261,28 @@ def create_derived_views(conn: sqlite3.Connection):
     
     logger.info(f"✓ Derived views verified")
 
+def rebuild_name_search(conn: sqlite3.Connection):
+    """Rebuild the trigram name-search tables from their content tables.
+    
+    Triggers keep them in sync during ingest; the rebuild is a cheap
+    backstop for databases written without recursive_triggers.
+    """
+    logger.info("\nRebuilding name search...")
+    cursor = conn.cursor()
+    
+    for table in ('locations_fts', 'theories_fts', 'people_fts', 'artifacts_fts'):
+        cursor.execute(f"INSERT INTO {table}({table}) VALUES('rebuild')")
+    
+    conn.commit()
+    logger.info(f"✓ Name search rebuilt")
+
+def analyze_indexes(conn: sqlite3.Connection):
+    """Refresh planner statistics so the API's lookups pick the right index."""
+    logger.info("\nAnalyzing indexes...")
+    conn.execute("ANALYZE")
+    conn.commit()
+    logger.info(f"✓ Index statistics updated")
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -296,6 +318,8 @@ def main():
     resolve_foreign_keys(conn)
     update_statistics(conn)
     create_derived_views(conn)
+    rebuild_name_search(conn)
+    analyze_indexes(conn)
     
     # Summary statistics
     logger.info("\n=== NORMALIZATION SUMMARY ===")
@@ -245,21 +245,25 @@ CREATE INDEX idx_events_location ON events(location_id);
 CREATE INDEX idx_events_season_episode ON events(season, episode);
 CREATE INDEX idx_events_type ON events(event_type);
 CREATE INDEX idx_events_timestamp ON events(season, episode, timestamp);
+CREATE INDEX idx_events_location_timestamp ON events(location_id, season, episode, timestamp);
 
 -- Person mention queries
 CREATE INDEX idx_person_mentions_person ON person_mentions(person_id);
 CREATE INDEX idx_person_mentions_season_episode ON person_mentions(season, episode);
 CREATE INDEX idx_person_mentions_timestamp ON person_mentions(season, episode, timestamp);
+CREATE INDEX idx_person_mentions_person_season ON person_mentions(person_id, season, episode);
 
 -- Theory mention queries
 CREATE INDEX idx_theory_mentions_theory ON theory_mentions(theory_id);
 CREATE INDEX idx_theory_mentions_season_episode ON theory_mentions(season, episode);
 CREATE INDEX idx_theory_mentions_timestamp ON theory_mentions(season, episode, timestamp);
+CREATE INDEX idx_theory_mentions_keyset ON theory_mentions(theory_id, season, episode);
 
 -- Artifact queries
 CREATE INDEX idx_artifacts_location ON artifacts(location_id);
 CREATE INDEX idx_artifacts_type ON artifacts(artifact_type);
 CREATE INDEX idx_artifacts_season_episode ON artifacts(season, episode);
+CREATE INDEX idx_artifacts_location_season ON artifacts(location_id, season, episode);
 
 -- Artifact relationship queries
 CREATE INDEX idx_artifact_findings_artifact ON artifact_findings(artifact_id);
@@ -278,6 +282,60 @@ CREATE INDEX idx_borehole_intervals_borehole ON borehole_intervals(borehole_id);
 CREATE INDEX idx_borehole_artifacts_borehole ON borehole_artifacts(borehole_id);
 CREATE INDEX idx_borehole_artifacts_artifact ON borehole_artifacts(artifact_id);
 
+-- ============================================================================
+-- NAME SEARCH (trigram FTS5, rebuilt by etl_normalize_semantic.py)
+-- ============================================================================
+
+-- Serve the API's substring name search (name LIKE '%q%') from an index
+CREATE VIRTUAL TABLE locations_fts USING fts5(name, content='locations', content_rowid='rowid', tokenize='trigram');
+CREATE VIRTUAL TABLE theories_fts USING fts5(name, content='theories', content_rowid='rowid', tokenize='trigram');
+CREATE VIRTUAL TABLE people_fts USING fts5(name, content='people', content_rowid='rowid', tokenize='trigram');
+CREATE VIRTUAL TABLE artifacts_fts USING fts5(name, content='artifacts', content_rowid='rowid', tokenize='trigram');
+
+-- Keep the name indexes in sync with their tables. INSERT OR REPLACE only
+-- fires the delete triggers with PRAGMA recursive_triggers=ON, which the ETL
+-- scripts set on their connections.
+CREATE TRIGGER locations_fts_ai AFTER INSERT ON locations BEGIN
+    INSERT INTO locations_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER locations_fts_ad AFTER DELETE ON locations BEGIN
+    INSERT INTO locations_fts(locations_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER locations_fts_au AFTER UPDATE OF name ON locations BEGIN
+    INSERT INTO locations_fts(locations_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO locations_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER theories_fts_ai AFTER INSERT ON theories BEGIN
+    INSERT INTO theories_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER theories_fts_ad AFTER DELETE ON theories BEGIN
+    INSERT INTO theories_fts(theories_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER theories_fts_au AFTER UPDATE OF name ON theories BEGIN
+    INSERT INTO theories_fts(theories_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO theories_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER people_fts_ai AFTER INSERT ON people BEGIN
+    INSERT INTO people_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER people_fts_ad AFTER DELETE ON people BEGIN
+    INSERT INTO people_fts(people_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER people_fts_au AFTER UPDATE OF name ON people BEGIN
+    INSERT INTO people_fts(people_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO people_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER artifacts_fts_ai AFTER INSERT ON artifacts BEGIN
+    INSERT INTO artifacts_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER artifacts_fts_ad AFTER DELETE ON artifacts BEGIN
+    INSERT INTO artifacts_fts(artifacts_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER artifacts_fts_au AFTER UPDATE OF name ON artifacts BEGIN
+    INSERT INTO artifacts_fts(artifacts_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO artifacts_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+
 -- ============================================================================
 -- VIEWS FOR COMMON ANALYTIC QUERIES
 -- ============================================================================
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for the Oak Island Hub Semantic API Server.
+
+Usage:
+    gunicorn -k gthread -w 2 --threads 8 -b 0.0.0.0:5000 wsgi:app
+
+Each gunicorn thread gets its own read-only SQLite connection from
+SemanticDB, so reads scale with workers x threads.
+"""
+
+from api_server_v2 import app
+
+__all__ = ['app']